@@ -163,13 +163,24 @@ class MainController(QObject):
             self._sync_controller_state()
         return success
     
-    def delete_form_revision(self, revision_id: int) -> None:
-        """Удаление одной ревизии формы (новая архитектура)"""
-        self.revision_controller.delete_form_revision(revision_id)
+    def delete_form_revision(self, revision_id: int, refresh_tree: bool = True) -> bool:
+        """Удаление одной ревизии формы (новая архитектура)
+        
+        Args:
+            revision_id: ID ревизии
+            refresh_tree: Перестроить дерево проектов после удаления
+                (False - вызывающий сам удаляет узел ревизии из дерева)
+        
+        Returns:
+            True, если ревизия удалена
+        """
+        success = self.revision_controller.delete_form_revision(revision_id)
         self._sync_controller_state()
-        # Обновляем список проектов после удаления
-        projects = self.project_controller.load_projects()
-        self.projects_updated.emit(projects)
+        if refresh_tree:
+            # Обновляем список проектов после удаления
+            projects = self.project_controller.load_projects()
+            self.projects_updated.emit(projects)
+        return success
     
     def update_form_revision(self, revision_id: int, revision_data: Dict[str, Any]) -> bool:
         """Обновление ревизии формы"""
@@ -96,7 +96,7 @@ class RevisionController(QObject):
     # Операции с ревизиями
     # ------------------------------------------------------------------
 
-    def delete_form_revision(self, revision_id: int) -> None:
+    def delete_form_revision(self, revision_id: int) -> bool:
         """Удаление одной ревизии формы (новая архитектура)"""
         try:
             self.db_manager.delete_form_revision(revision_id)
@@ -107,8 +107,10 @@ class RevisionController(QObject):
                     self.current_project.data = {}
                 if self.current_form:
                     self.current_form = None
+            return True
         except Exception as e:
             self.error_occurred.emit(f"Ошибка удаления ревизии: {e}")
+            return False
 
     def update_form_revision(self, revision_id: int, revision_data: Dict[str, Any]) -> bool:
         """Обновление ревизии формы"""
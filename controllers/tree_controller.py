@@ -68,6 +68,11 @@ class TreeController(QObject):
         municipalities_all = self.db_manager.load_municipalities()
         municipalities_by_id = {m.id: m for m in municipalities_all if m.id is not None}
 
+        # Формы и ревизии всех проектов загружаем двумя запросами и индексируем
+        # по владельцу (вместо отдельных запросов на каждый проект и каждую форму)
+        forms_by_project = self.db_manager.load_project_forms_grouped()
+        revisions_by_form = self.db_manager.load_form_revisions_grouped()
+
         # Год → { project_id → ... }
         years_map = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: defaultdict(list))))
 
@@ -87,8 +92,8 @@ class TreeController(QObject):
             _ = years_map[year_key][project.id]
 
             # Загружаем project_forms и form_revisions для данного проекта
-            project_forms = self.db_manager.load_project_forms(project.id)
-            project_forms_map[project.id] = project_forms or []
+            project_forms = forms_by_project.get(project.id, [])
+            project_forms_map[project.id] = project_forms
 
             # Если у проекта нет ревизий (нет загруженных форм), 
             # добавляем проект в years_map с пустым forms_map
@@ -111,7 +116,7 @@ class TreeController(QObject):
                 period_obj = periods_by_id.get(pf.period_id) if pf.period_id else None
                 period_code = period_obj.code if period_obj else "Y"
 
-                revisions = self.db_manager.load_form_revisions(pf.id)
+                revisions = revisions_by_form.get(pf.id)
                 # Ревизии создаются только при загрузке формы, поэтому если их нет - пропускаем
                 if not revisions:
                     continue
@@ -190,13 +195,10 @@ class TreeController(QObject):
                         form_entry["periods"].append(period_entry)
                         proj_entry["forms"].append(form_entry)
 
-                    # Сортируем формы/периоды
+                    # Сортируем формы по коду и периоды внутри форм
                     proj_entry["forms"].sort(key=lambda f: f["form_code"])
                     for f in proj_entry["forms"]:
                         f["periods"].sort(key=lambda p: p["period_code"])
-
-                    # Сортируем формы по коду
-                    proj_entry["forms"].sort(key=lambda f: f["form_code"])
                 
                 # Добавляем проект в дерево (даже если у него нет форм - это проект без загруженных ревизий)
                 year_entry["projects"].append(proj_entry)
@@ -23,10 +23,22 @@ from .form_0503317 import Form0503317Constants
 class DatabaseManager:
     """Менеджер базы данных"""
     
+    # Поколение справочников годов и МО (общее для всех экземпляров):
+    # увеличивается при их изменении, по нему внешние кэши определяют устаревание
+    _reference_generation = 0
+    
     def __init__(self, db_path: str = "budget_forms.db"):
         self.db_path = db_path
         self._init_database()
     
+    def invalidate_reference_caches(self) -> None:
+        """Пометить кэши справочников годов и МО как устаревшие"""
+        DatabaseManager._reference_generation += 1
+    
+    def reference_generation(self) -> int:
+        """Текущее поколение справочников годов и МО"""
+        return DatabaseManager._reference_generation
+    
     def _init_database(self):
         """Инициализация базы данных"""
         with sqlite3.connect(self.db_path) as conn:
@@ -1360,6 +1372,7 @@ class DatabaseManager:
             )
             year_id = cursor.lastrowid
             conn.commit()
+            self.invalidate_reference_caches()
             return YearRef.from_row({'id': year_id, 'year': year, 'is_active': 1})
 
     def load_years(self) -> List[YearRef]:
@@ -1381,6 +1394,7 @@ class DatabaseManager:
                     [(y.year, 1 if y.is_active else 0) for y in years],
                 )
             conn.commit()
+        self.invalidate_reference_caches()
 
     # ----- Справочник МО -----
 
@@ -1411,6 +1425,7 @@ class DatabaseManager:
             )
             m_id = cursor.lastrowid
             conn.commit()
+            self.invalidate_reference_caches()
             return MunicipalityRef.from_row({'id': m_id, 'code': code, 'name': name, 'is_active': 1})
 
     def load_municipalities(self) -> List[MunicipalityRef]:
@@ -1484,6 +1499,7 @@ class DatabaseManager:
                     ],
                 )
             conn.commit()
+        self.invalidate_reference_caches()
 
     # ----- Справочник типов форм -----
 
@@ -1701,6 +1717,24 @@ class DatabaseManager:
                 )
         return result
 
+    def load_project_forms_grouped(self) -> Dict[int, List[ProjectForm]]:
+        """Формы всех проектов одним запросом: {project_id: [ProjectForm, ...]}"""
+        result: Dict[int, List[ProjectForm]] = {}
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT id, project_id, form_type_id, period_id '
+                'FROM project_forms ORDER BY id'
+            )
+            for row in cursor.fetchall():
+                result.setdefault(row[1], []).append(
+                    ProjectForm.from_row(
+                        {'id': row[0], 'project_id': row[1],
+                         'form_type_id': row[2], 'period_id': row[3]}
+                    )
+                )
+        return result
+
     def get_project_form_by_id(self, project_form_id: int) -> Optional[ProjectForm]:
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
@@ -1812,6 +1846,30 @@ class DatabaseManager:
                 }
             )
 
+    def load_form_revisions_grouped(self) -> Dict[int, List[FormRevisionRecord]]:
+        """Ревизии всех форм одним запросом: {project_form_id: [FormRevisionRecord, ...]}"""
+        result: Dict[int, List[FormRevisionRecord]] = {}
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT id, project_form_id, revision, status, file_path, created_at '
+                'FROM form_revisions ORDER BY id'
+            )
+            for row in cursor.fetchall():
+                result.setdefault(row[1], []).append(
+                    FormRevisionRecord.from_row(
+                        {
+                            'id': row[0],
+                            'project_form_id': row[1],
+                            'revision': row[2],
+                            'status': row[3],
+                            'file_path': row[4],
+                            'created_at': row[5],
+                        }
+                    )
+                )
+        return result
+
     def load_form_revisions(self, project_form_id: int) -> List[FormRevisionRecord]:
         result: List[FormRevisionRecord] = []
         with sqlite3.connect(self.db_path) as conn:
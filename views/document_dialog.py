@@ -125,8 +125,8 @@ class DocumentDialog(QDialog):
                     # Сохраняем путь в главном окне для возможности открытия
                     if hasattr(parent, 'last_exported_file'):
                         parent.last_exported_file = result_path
-                    if hasattr(parent, 'open_last_file_action'):
-                        parent.open_last_file_action.setEnabled(True)
+                    if hasattr(parent, 'menu_bar'):
+                        parent.menu_bar.get('open_last_file').setEnabled(True)
                     if hasattr(parent, 'open_last_file_btn'):
                         parent.open_last_file_btn.setEnabled(True)
                     
@@ -181,8 +181,8 @@ class DocumentDialog(QDialog):
                     if hasattr(parent, 'last_exported_file'):
                         # Сохраняем последний созданный файл (приоритет письму администрации)
                         parent.last_exported_file = result.get('admin') or result.get('council')
-                    if hasattr(parent, 'open_last_file_action'):
-                        parent.open_last_file_action.setEnabled(True)
+                    if hasattr(parent, 'menu_bar'):
+                        parent.menu_bar.get('open_last_file').setEnabled(True)
                     if hasattr(parent, 'open_last_file_btn'):
                         parent.open_last_file_btn.setEnabled(True)
                     
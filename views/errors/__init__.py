@@ -1,4 +1,5 @@
 """Работа с ошибками"""
 from .errors_manager import ErrorsManager
+from .errors_table_model import ErrorsTableModel
 
-__all__ = ['ErrorsManager']
+__all__ = ['ErrorsManager', 'ErrorsTableModel']
@@ -1,7 +1,6 @@
 """Управление ошибками расчетов"""
-from PyQt5.QtWidgets import QTableWidgetItem, QComboBox, QLabel, QTableWidget, QMessageBox, QFileDialog
+from PyQt5.QtWidgets import QComboBox, QLabel, QTableView, QMessageBox, QFileDialog
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor, QBrush
 from logger import logger
 from services.error_checker_service import ErrorCheckerService
 from utils.numeric_utils import format_numeric_value
@@ -83,58 +82,11 @@ class ErrorsManager:
         if selected_section != "Все":
             filtered_errors = [e for e in self.errors_data if e['section'] == selected_section]
         
-        # Очищаем таблицу
-        errors_table.setRowCount(0)
-        
-        # Заполнение таблицы
-        errors_table.setRowCount(len(filtered_errors))
-        
-        error_color = QColor("#FF6B6B")
-        
-        for row_idx, error in enumerate(filtered_errors):
-            # Раздел
-            errors_table.setItem(row_idx, 0, QTableWidgetItem(error['section']))
-            
-            # Наименование
-            name_item = QTableWidgetItem(error['name'])
-            name_item.setForeground(QBrush(error_color))
-            errors_table.setItem(row_idx, 1, name_item)
-            
-            # Код строки
-            errors_table.setItem(row_idx, 2, QTableWidgetItem(str(error['code'])))
-            
-            # Уровень
-            errors_table.setItem(row_idx, 3, QTableWidgetItem(str(error['level'])))
-            
-            # Тип
-            errors_table.setItem(row_idx, 4, QTableWidgetItem(error['type']))
-            
-            # Колонка
-            errors_table.setItem(row_idx, 5, QTableWidgetItem(error['column']))
-            
-            # Оригинальное значение
-            orig_text = self._format_error_value(error['original'])
-            orig_item = QTableWidgetItem(orig_text)
-            errors_table.setItem(row_idx, 6, orig_item)
-            
-            # Расчетное значение
-            calc_text = self._format_error_value(error['calculated'])
-            calc_item = QTableWidgetItem(calc_text)
-            calc_item.setForeground(QBrush(error_color))
-            errors_table.setItem(row_idx, 7, calc_item)
-            
-            # Разница
-            diff_text = self._format_error_value(error['difference'])
-            diff_item = QTableWidgetItem(diff_text)
-            diff_item.setForeground(QBrush(error_color))
-            errors_table.setItem(row_idx, 8, diff_item)
-        
-        # Убеждаемся, что режим изменения размера столбцов установлен
-        from PyQt5.QtWidgets import QHeaderView
-        header = errors_table.horizontalHeader()
-        header.setStretchLastSection(False)
-        for i in range(9):
-            header.setSectionResizeMode(i, QHeaderView.Interactive)
+        # Заполнение таблицы: модель хранит список ошибок, ячейки
+        # формируются представлением только для видимых строк
+        # (строки заменяются без сброса модели, поэтому режимы и ширина
+        # столбцов, заданные при создании таблицы, сохраняются)
+        errors_table.model().set_errors(filtered_errors)
         
         # Обновление статистики
         if stats_label:
@@ -214,7 +166,7 @@ class ErrorsManager:
                 errors_table = None
                 errors_filter = None
                 errors_stats = None
-                for child in tab_widget.findChildren(QTableWidget):
+                for child in tab_widget.findChildren(QTableView):
                     errors_table = child
                     break
                 for child in tab_widget.findChildren(QComboBox):
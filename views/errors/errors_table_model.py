@@ -0,0 +1,77 @@
+"""Модель таблицы ошибок расчетов"""
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QColor, QBrush
+from utils.numeric_utils import format_numeric_value
+
+
+class ErrorsTableModel(QAbstractTableModel):
+    """Модель ошибок расчетов: строки создаются представлением только для видимой области"""
+
+    HEADERS = (
+        "Раздел",
+        "Наименование",
+        "Код строки",
+        "Уровень",
+        "Тип",
+        "Колонка",
+        "Оригинальное",
+        "Расчетное",
+        "Разница"
+    )
+    # Начальная ширина столбцов в пикселях (в порядке HEADERS)
+    COLUMN_WIDTHS = (120, 300, 100, 60, 120, 100, 120, 120, 120)
+
+    # Ключи словаря ошибки по столбцам; значения столбцов 6-8 форматируются как числа
+    _KEYS = ("section", "name", "code", "level", "type", "column",
+             "original", "calculated", "difference")
+    _NUMERIC_COLUMNS = frozenset((6, 7, 8))
+    # Столбцы, выделяемые цветом ошибки
+    _ERROR_COLUMNS = frozenset((1, 7, 8))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._errors = []
+        self._error_brush = QBrush(QColor("#FF6B6B"))
+
+    def set_errors(self, errors):
+        """
+        Замена списка отображаемых ошибок
+
+        Строки удаляются и вставляются (а не сбрасывается вся модель),
+        чтобы заголовок таблицы сохранял ширину столбцов.
+
+        Args:
+            errors: Список словарей ошибок (ErrorCheckerService)
+        """
+        if self._errors:
+            self.beginRemoveRows(QModelIndex(), 0, len(self._errors) - 1)
+            self._errors = []
+            self.endRemoveRows()
+        if errors:
+            self.beginInsertRows(QModelIndex(), 0, len(errors) - 1)
+            self._errors = list(errors)
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._errors)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        column = index.column()
+        if role == Qt.DisplayRole:
+            value = self._errors[index.row()][self._KEYS[column]]
+            if column in self._NUMERIC_COLUMNS:
+                return format_numeric_value(value)
+            return str(value)
+        if role == Qt.ForegroundRole and column in self._ERROR_COLUMNS:
+            return self._error_brush
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
@@ -5,9 +5,9 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QToolBar, QStatusBar, QAction, QTextEdit,
                              QComboBox, QTreeWidget, QTreeWidgetItem, QMenu, 
                              QInputDialog, QDialog, QDialogButtonBox, QFormLayout,
-                             QLineEdit, QCheckBox, QApplication, QStyle, QToolButton,
+                             QLineEdit, QCheckBox, QStyle, QToolButton,
                              QSpinBox, QWidgetAction)
-from PyQt5.QtCore import Qt, QTimer, QSize, QRect
+from PyQt5.QtCore import Qt, QTimer, QSize, QRect, QEvent
 from PyQt5.QtGui import (QFont, QColor, QBrush, QTextDocument, QTextOption, 
                         QTextCharFormat, QTextCursor, QPainter)
 import os
@@ -22,7 +22,6 @@ from logger import logger
 from models.constants.form_0503317_constants import Form0503317Constants
 from views.project_dialog import ProjectDialog
 from views.reference_dialog import ReferenceDialog
-from views.excel_viewer import ExcelViewer
 from views.reference_viewer import ReferenceViewer
 from views.dictionaries_dialog import DictionariesDialog
 from views.references_management_dialog import ReferencesManagementDialog
@@ -30,6 +29,7 @@ from views.form_load_dialog import FormLoadDialog
 from views.document_dialog import DocumentDialog
 from views.widgets import WrapHeaderView, WordWrapItemDelegate, DetachedTabWindow
 from views.menu import MenuBar, ToolBar
+from views.menu.menu_bar import clear_icon_cache
 from views.panels import ProjectsPanel, TabsPanel
 from views.tree import TreeBuilder, TreeConfig, TreeHandlers
 from views.errors import ErrorsManager
@@ -39,6 +39,49 @@ from views.metadata import MetadataPanel
 class MainWindow(QMainWindow):
     """Главное окно приложения"""
     
+    # Обработчики клавиш окна: код клавиши -> имя метода
+    _KEY_HANDLERS = {
+        Qt.Key_F11: "_handle_f11",
+    }
+    
+    # Текст окна "О программе"
+    _ABOUT_HTML = (
+        "<h2>Система обработки бюджетных форм</h2>"
+        "<p>Версия 1.0</p>"
+        "<p>Приложение для обработки и анализа бюджетных форм, "
+        "включая формы 0503317 и другие.</p>"
+        "<p><b>Основные возможности:</b></p>"
+        "<ul>"
+        "<li>Загрузка и парсинг бюджетных форм</li>"
+        "<li>Расчет агрегированных сумм</li>"
+        "<li>Валидация данных</li>"
+        "<li>Работа со справочниками</li>"
+        "<li>Экспорт с проверкой</li>"
+        "</ul>"
+    )
+    
+    # Таблица горячих клавиш
+    _SHORTCUTS_HTML = """
+        <h2>Горячие клавиши</h2>
+        <table border="1" cellpadding="5">
+        <tr><th>Действие</th><th>Клавиша</th></tr>
+        <tr><td>Новый проект</td><td><b>Ctrl+N</b></td></tr>
+        <tr><td>Загрузить форму</td><td><b>Ctrl+O</b></td></tr>
+        <tr><td>Экспорт проверки</td><td><b>Ctrl+E</b></td></tr>
+        <tr><td>Выход</td><td><b>Ctrl+Q</b></td></tr>
+        <tr><td>Редактировать проект</td><td><b>Ctrl+P</b></td></tr>
+        <tr><td>Удалить проект</td><td><b>Ctrl+Delete</b></td></tr>
+        <tr><td>Обновить список</td><td><b>F5</b></td></tr>
+        <tr><td>Пересчитать суммы</td><td><b>F9</b></td></tr>
+        <tr><td>Ошибки расчетов</td><td><b>Ctrl+Shift+E</b></td></tr>
+        <tr><td>Скрыть нулевые столбцы</td><td><b>Ctrl+H</b></td></tr>
+        <tr><td>Просмотр справочников</td><td><b>Ctrl+R</b></td></tr>
+        <tr><td>Справочники конфигурации</td><td><b>Ctrl+D</b></td></tr>
+        <tr><td>Панель проектов</td><td><b>Ctrl+1</b></td></tr>
+        <tr><td>Полноэкранный режим</td><td><b>F11</b></td></tr>
+        </table>
+        """
+    
     def __init__(self):
         super().__init__()
         self.controller = MainController()
@@ -56,14 +99,41 @@ class MainWindow(QMainWindow):
         self._updating_header_height = False  # Флаг для предотвращения бесконечного цикла
         self.last_exported_file = None  # Путь к последнему экспортированного файла
         self.errors_tab_fullscreen = False  # Флаг полноэкранного режима вкладки ошибок
+        self._is_fullscreen = False  # Текущее полноэкранное состояние окна (без запроса к Qt)
         # Окна для открепленных вкладок
         self.detached_windows = {}  # {tab_name: QMainWindow}
         self.tabs_panel = None  # Будет установлен в create_tabs_panel
         # Настройки шрифтов
         self.font_size = 10  # Размер шрифта для данных
         self.header_font_size = 10  # Размер шрифта для заголовков
+        # Виджеты дерева для применения шрифтов (сбрасывается при откреплении/возврате вкладок)
+        self._tree_widgets_cache = None
+        # Применение шрифтов откладывается: серия изменений спинбоксов дает один проход
+        self._font_apply_timer = QTimer(self)
+        self._font_apply_timer.setSingleShot(True)
+        self._font_apply_timer.setInterval(50)
+        self._font_apply_timer.timeout.connect(self.apply_font_sizes)
         # Отслеживание выделения
         self.selection_start_column = None  # Столбец, с которого началось выделение
+        # Пересчет суммы выделения: клик и смена выделения объединяются в один расчет
+        self._sel_sum_timer = QTimer(self)
+        self._sel_sum_timer.setSingleShot(True)
+        self._sel_sum_timer.setInterval(10)
+        self._sel_sum_timer.timeout.connect(self.on_tree_selection_changed)
+        # Отложенное применение видимости столбцов (объединяет повторные запросы)
+        self._column_visibility_pending = False
+        # Элементы управления вкладки данных (устанавливаются в create_tabs_panel)
+        self.hide_zero_columns_checkbox = None
+        self.recalculate_btn = None
+        self.export_calculated_btn = None
+        self.show_errors_btn = None
+        self.documents_menu_btn = None
+        self.open_last_file_btn = None
+        self.excel_viewer = None
+        # Виджеты вкладок по названию (заполняется в create_tabs_panel)
+        self.tab_widgets = {}
+        # Окно горячих клавиш (создается при первом показе)
+        self._shortcuts_msg = None
         
         # Инициализируем компоненты интерфейса
         self.projects_panel_obj = ProjectsPanel(self)
@@ -73,6 +143,7 @@ class MainWindow(QMainWindow):
         self.tree_handlers = TreeHandlers(self)
         self.errors_manager = ErrorsManager(self)
         self.metadata_panel = MetadataPanel(self)
+        self.menu_bar = MenuBar(self)
         
         # Инициализируем менеджеры и контроллеры
         from views.managers.tab_manager import TabManager
@@ -135,8 +206,7 @@ class MainWindow(QMainWindow):
     
     def create_menu_bar(self):
         """Создание меню-бара"""
-        menu_bar = MenuBar(self)
-        menu_bar.create_menu_bar()
+        self.menu_bar.create_menu_bar()
     
     def create_toolbar(self):
         """Создание тулбара"""
@@ -603,7 +673,7 @@ class MainWindow(QMainWindow):
             excel_path = project_info.get('excel_path')
             if excel_path and os.path.exists(excel_path):
                 # excel_path уже содержит путь к исходному файлу ревизии из revision_record.file_path
-                self.excel_viewer.load_excel_file(excel_path)
+                self.tabs_panel_obj.ensure_excel_viewer().load_excel_file(excel_path)
             # Если файл не найден, просто не загружаем его
 
             self.status_bar.showMessage(f"Проект '{project.name}' загружен")
@@ -660,21 +730,33 @@ class MainWindow(QMainWindow):
         self.current_section = section_name
         # Сбрасываем столбец выделения при смене раздела
         self.selection_start_column = None
-        if self.controller.current_project:
-            self.tree_builder.load_project_data_to_tree(self.controller.current_project)
-            # Применяем скрытие нулевых столбцов, если чекбокс включен
-            if hasattr(self, 'hide_zero_columns_checkbox') and self.hide_zero_columns_checkbox.isChecked():
-                QTimer.singleShot(200, lambda: self.apply_hide_zero_columns())
+        project = self.controller.current_project
+        if project:
+            # Скрытие нулевых столбцов (если чекбокс включен) планирует сама загрузка дерева
+            self.tree_builder.load_project_data_to_tree(project)
     
     def on_data_type_changed(self, data_type):
         """Обработка смены типа данных"""
         self.current_data_type = data_type
-        self.tree_config.apply_tree_data_type_visibility()
-        # Применяем скрытие нулевых столбцов, если чекбокс включен
-        if hasattr(self, 'hide_zero_columns_checkbox') and self.hide_zero_columns_checkbox.isChecked():
+        # Содержимое дерева от типа данных не зависит: перестраивать его не нужно,
+        # достаточно один раз применить видимость столбцов
+        self._schedule_column_visibility()
+    
+    def _schedule_column_visibility(self):
+        """Запланировать применение видимости столбцов (повторные вызовы объединяются)"""
+        if self._column_visibility_pending:
+            return
+        self._column_visibility_pending = True
+        QTimer.singleShot(0, self._apply_column_visibility)
+    
+    def _apply_column_visibility(self):
+        """Применить видимость столбцов по типу данных и скрытие нулевых столбцов"""
+        self._column_visibility_pending = False
+        if self.hide_zero_columns_checkbox is not None and self.hide_zero_columns_checkbox.isChecked():
+            # Включает и применение видимости по типу данных
             self.apply_hide_zero_columns()
-        if self.controller.current_project:
-            self.tree_builder.load_project_data_to_tree(self.controller.current_project)
+        else:
+            self.tree_config.apply_tree_data_type_visibility()
     
     def on_hide_zero_columns_changed(self, state):
         """Обработка изменения состояния чекбокса 'Скрыть нулевые столбцы'"""
@@ -685,7 +767,8 @@ class MainWindow(QMainWindow):
     
     def apply_hide_zero_columns(self):
         """Применить скрытие нулевых столбцов"""
-        if not (self.controller.current_project and self.controller.current_project.data):
+        project = self.controller.current_project
+        if not (project and project.data):
             logger.debug("apply_hide_zero_columns: нет проекта или данных")
             return
 
@@ -696,25 +779,37 @@ class MainWindow(QMainWindow):
             "Консолидируемые расчеты": "консолидируемые_расчеты_data"
         }
         section_key = section_map.get(self.current_section)
-        if not section_key or section_key not in self.controller.current_project.data:
+        if not section_key or section_key not in project.data:
             logger.debug(f"apply_hide_zero_columns: раздел {self.current_section} не найден")
             return
 
-        data = self.controller.current_project.data[section_key]
+        data = project.data[section_key]
         if not data:
             logger.debug(f"apply_hide_zero_columns: нет данных для раздела {section_key}")
             return
 
         logger.debug(f"apply_hide_zero_columns: применяю скрытие для раздела {section_key}, записей: {len(data)}")
 
-        # Сначала показываем все столбцы
-        self.tree_handlers.show_all_columns()
-        
-        # Применяем отображение колонок в зависимости от выбранного типа данных
-        self.tree_config.apply_tree_data_type_visibility()
+        # Вся последовательность перенастройки выполняется с одной перерисовкой в конце
+        frozen_widgets = [(tree, tree.header(), tree.updatesEnabled()) for tree in self.tree_builder._get_tree_widgets()]
+        for tree, header, _ in frozen_widgets:
+            tree.setUpdatesEnabled(False)
+            header.setUpdatesEnabled(False)
+        try:
+            # Сначала показываем все столбцы
+            self.tree_handlers.show_all_columns()
+            
+            # Применяем отображение колонок в зависимости от выбранного типа данных
+            self.tree_config.apply_tree_data_type_visibility()
 
-        # Затем применяем скрытие нулевых столбцов (после применения видимости по типу данных)
-        self.tree_config.hide_zero_columns_in_tree(section_key, data)
+            # Затем применяем скрытие нулевых столбцов (после применения видимости по типу данных)
+            self.tree_config.hide_zero_columns_in_tree(section_key, data)
+        finally:
+            for tree, _, was_updating in frozen_widgets:
+                # Заголовок берем заново: при перенастройке он мог быть заменен
+                tree.header().setUpdatesEnabled(True)
+                tree.setUpdatesEnabled(was_updating)
+                tree.viewport().update()
     
     def expand_all_tree(self):
         """Развернуть все узлы дерева"""
@@ -955,13 +1050,13 @@ class MainWindow(QMainWindow):
     
     def update_revision_buttons_state(self, has_revision: bool):
         """Обновление состояния кнопок ревизии в зависимости от наличия выбранной ревизии"""
-        if hasattr(self, 'recalculate_btn'):
+        if self.recalculate_btn is not None:
             self.recalculate_btn.setEnabled(has_revision)
-        if hasattr(self, 'export_calculated_btn'):
+        if self.export_calculated_btn is not None:
             self.export_calculated_btn.setEnabled(has_revision)
-        if hasattr(self, 'show_errors_btn'):
+        if self.show_errors_btn is not None:
             self.show_errors_btn.setEnabled(has_revision)
-        if hasattr(self, 'documents_menu_btn'):
+        if self.documents_menu_btn is not None:
             self.documents_menu_btn.setEnabled(has_revision)
     
     def calculate_sums(self):
@@ -982,11 +1077,12 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(False)
         QMessageBox.information(self, "Успех", "Расчет завершен")
         
-        # Обновляем отображение данных
-        if self.controller.current_project:
-            self.tree_builder.load_project_data_to_tree(self.controller.current_project)
+        # Обновляем отображение данных (только изменившиеся ячейки)
+        project = self.controller.current_project
+        if project:
+            self.tree_builder.update_project_data_in_tree(project)
             # Обновляем вкладку ошибок
-            self.errors_manager.load_errors_to_tab(self.controller.current_project.data)
+            self.errors_manager.load_errors_to_tab(project.data)
 
     def export_validation(self):
         """Экспорт формы с проверкой (обертка для экспорта пересчитанной таблицы)"""
@@ -994,7 +1090,8 @@ class MainWindow(QMainWindow):
     
     def export_calculated_table(self):
         """Экспорт пересчитанной таблицы"""
-        if not self.controller.current_project or not self.controller.current_revision_id:
+        project = self.controller.current_project
+        if not project or not self.controller.current_revision_id:
             QMessageBox.warning(self, "Ошибка", "Сначала выберите проект и загрузите ревизию формы")
             return
         
@@ -1006,7 +1103,7 @@ class MainWindow(QMainWindow):
         output_path, _ = QFileDialog.getSaveFileName(
             self,
             "Сохранить пересчитанную форму",
-            f"{self.controller.current_project.name}_рев{revision_text}_пересчет.xlsx",
+            f"{project.name}_рев{revision_text}_пересчет.xlsx",
             "Excel files (*.xlsx)"
         )
         
@@ -1019,7 +1116,7 @@ class MainWindow(QMainWindow):
     def _process_export(self, output_path):
         """Обработка экспорта"""
         # Перед экспортом убеждаемся, что просмотрщик Excel не держит файл открытым
-        if hasattr(self, "excel_viewer") and self.excel_viewer is not None:
+        if self.excel_viewer is not None:
             try:
                 self.excel_viewer.close_workbook()
             except Exception:
@@ -1032,8 +1129,8 @@ class MainWindow(QMainWindow):
         if success:
             # Сохраняем путь к последнему экспортированному файлу
             self.last_exported_file = output_path
-            self.open_last_file_action.setEnabled(True)
-            if hasattr(self, 'open_last_file_btn'):
+            self.menu_bar.get('open_last_file').setEnabled(True)
+            if self.open_last_file_btn is not None:
                 self.open_last_file_btn.setEnabled(True)
             
             # Предлагаем открыть файл
@@ -1115,44 +1212,50 @@ class MainWindow(QMainWindow):
     
     def on_font_size_changed(self, size: int):
         """Обработка изменения размера шрифта данных"""
+        if size == self.font_size:
+            return
         self.font_size = size
-        self.apply_font_sizes()
+        self._font_apply_timer.start()
     
     def on_header_font_size_changed(self, size: int):
         """Обработка изменения размера шрифта заголовков"""
+        if size == self.header_font_size:
+            return
         self.header_font_size = size
-        self.apply_font_sizes()
+        self._font_apply_timer.start()
     
     def apply_font_sizes(self):
         """Применение размеров шрифтов ко всем деревьям"""
-        # Получаем все виджеты дерева
-        tree_widgets = self.tree_builder._get_tree_widgets()
+        # Получаем все виджеты дерева (список кэшируется до открепления/возврата вкладок)
+        tree_widgets = self._tree_widgets_cache
+        if tree_widgets is None:
+            tree_widgets = self.tree_builder._get_tree_widgets()
+            self._tree_widgets_cache = tree_widgets
         
         for tree_widget in tree_widgets:
-            if tree_widget:
-                # Применяем размер шрифта к дереву данных
+            if not tree_widget:
+                continue
+            # Шрифты и высота заголовка меняются с одной перерисовкой в конце
+            tree_widget.setUpdatesEnabled(False)
+            try:
+                # Применяем размер шрифта к дереву данных (если он изменился)
                 font = tree_widget.font()
-                font.setPointSize(self.font_size)
-                tree_widget.setFont(font)
+                if font.pointSize() != self.font_size:
+                    font.setPointSize(self.font_size)
+                    tree_widget.setFont(font)
                 
                 # Применяем размер шрифта к заголовкам
                 header = tree_widget.header()
                 if header:
                     header_font = header.font()
-                    header_font.setPointSize(self.header_font_size)
-                    header.setFont(header_font)
-                    
-                    # Обновляем высоту заголовка с учетом нового размера шрифта
-                    self.tree_config._update_tree_header_height(tree_widget)
-                
-                # Обновляем делегат, если он использует шрифт
-                delegate = tree_widget.itemDelegate()
-                if delegate:
-                    # Делегат будет использовать шрифт из option, который берется из виджета
-                    tree_widget.update()
-        
-        # Обновляем отображение
-        QApplication.processEvents()
+                    if header_font.pointSize() != self.header_font_size:
+                        header_font.setPointSize(self.header_font_size)
+                        header.setFont(header_font)
+                        
+                        # Обновляем высоту заголовка с учетом нового размера шрифта
+                        self.tree_config._update_tree_header_height(tree_widget)
+            finally:
+                tree_widget.setUpdatesEnabled(True)
     
     def toggle_fullscreen(self, checked: bool):
         """Переключить полноэкранный режим"""
@@ -1164,6 +1267,7 @@ class MainWindow(QMainWindow):
                 self.showFullScreen()
             else:
                 self.showNormal()
+            self._is_fullscreen = bool(checked)
     
     def _toggle_errors_tab_fullscreen(self):
         """Переключение полноэкранного режима для вкладки ошибок"""
@@ -1171,28 +1275,48 @@ class MainWindow(QMainWindow):
             # Выходим из полноэкранного режима
             self.errors_tab_fullscreen = False
             self.showNormal()
+            self._is_fullscreen = False
         else:
             # Входим в полноэкранный режим
             self.errors_tab_fullscreen = True
             self.showFullScreen()
+            self._is_fullscreen = True
     
     def keyPressEvent(self, event):
         """Обработка нажатий клавиш"""
-        if event.key() == Qt.Key_F11:
-            # Если активна вкладка ошибок, переключаем её полноэкранный режим
-            if self.tabs_panel and self.tabs_panel.currentWidget() == self.errors_tab:
-                self._toggle_errors_tab_fullscreen()
-            else:
-                # Иначе переключаем полноэкранный режим главного окна
-                self.toggle_fullscreen(not self.isFullScreen())
+        handler_name = self._KEY_HANDLERS.get(event.key())
+        if handler_name is not None:
+            getattr(self, handler_name)(event)
         else:
             super().keyPressEvent(event)
     
+    def _handle_f11(self, event):
+        """Обработка F11: полноэкранный режим вкладки ошибок или главного окна"""
+        # Если активна вкладка ошибок, переключаем её полноэкранный режим
+        if self.tabs_panel and self.tabs_panel.currentWidget() == self.errors_tab:
+            self._toggle_errors_tab_fullscreen()
+        else:
+            # Иначе переключаем полноэкранный режим главного окна
+            self.toggle_fullscreen(not self._is_fullscreen)
+    
+    def changeEvent(self, event):
+        """Синхронизация флага полноэкранного режима при смене состояния окна извне"""
+        if event.type() == QEvent.WindowStateChange:
+            self._is_fullscreen = bool(self.windowState() & Qt.WindowFullScreen)
+        elif event.type() == QEvent.StyleChange:
+            # Иконки меню зависят от стиля - сбрасываем кэш
+            clear_icon_cache()
+        super().changeEvent(event)
+    
     def on_tree_item_clicked(self, item, column):
         """Обработчик клика по элементу дерева (делегирует к tree_handlers)"""
         self.tree_handlers.on_tree_item_clicked(item, column)
-        # Также обновляем сумму сразу после клика
-        QTimer.singleShot(10, self.on_tree_selection_changed)
+        # Сумму пересчитываем после клика (столбец начала выделения уже известен)
+        self._sel_sum_timer.start()
+    
+    def schedule_tree_selection_sum(self):
+        """Отложенный пересчет суммы выделения (повторные вызовы перезапускают таймер)"""
+        self._sel_sum_timer.start()
     
     def on_tree_selection_changed(self):
         """Обработчик изменения выделения (делегирует к tree_handlers)"""
@@ -1200,22 +1324,7 @@ class MainWindow(QMainWindow):
     
     def show_about(self):
         """Показать информацию о программе"""
-        QMessageBox.about(
-            self,
-            "О программе",
-            "<h2>Система обработки бюджетных форм</h2>"
-            "<p>Версия 1.0</p>"
-            "<p>Приложение для обработки и анализа бюджетных форм, "
-            "включая формы 0503317 и другие.</p>"
-            "<p><b>Основные возможности:</b></p>"
-            "<ul>"
-            "<li>Загрузка и парсинг бюджетных форм</li>"
-            "<li>Расчет агрегированных сумм</li>"
-            "<li>Валидация данных</li>"
-            "<li>Работа со справочниками</li>"
-            "<li>Экспорт с проверкой</li>"
-            "</ul>"
-        )
+        QMessageBox.about(self, "О программе", self._ABOUT_HTML)
     
     def show_calculation_errors(self):
         """Показать вкладку с ошибками расчетов"""
@@ -1230,41 +1339,22 @@ class MainWindow(QMainWindow):
         # Загружаем ошибки из текущих данных проекта
         self.errors_manager.load_errors_to_tab(self.controller.current_project.data)
         
-        # Переключаемся на вкладку ошибок
+        # Переключаемся на вкладку ошибок (если она не откреплена)
         tabs = self.tabs_panel
         if tabs:
-            for i in range(tabs.count()):
-                if tabs.tabText(i) == "Ошибки":
-                    tabs.setCurrentIndex(i)
-                    break
+            errors_index = tabs.indexOf(self.tab_widgets.get("Ошибки", self.errors_tab))
+            if errors_index >= 0:
+                tabs.setCurrentIndex(errors_index)
     
     def show_shortcuts(self):
         """Показать список горячих клавиш"""
-        shortcuts_text = """
-        <h2>Горячие клавиши</h2>
-        <table border="1" cellpadding="5">
-        <tr><th>Действие</th><th>Клавиша</th></tr>
-        <tr><td>Новый проект</td><td><b>Ctrl+N</b></td></tr>
-        <tr><td>Загрузить форму</td><td><b>Ctrl+O</b></td></tr>
-        <tr><td>Экспорт проверки</td><td><b>Ctrl+E</b></td></tr>
-        <tr><td>Выход</td><td><b>Ctrl+Q</b></td></tr>
-        <tr><td>Редактировать проект</td><td><b>Ctrl+P</b></td></tr>
-        <tr><td>Удалить проект</td><td><b>Ctrl+Delete</b></td></tr>
-        <tr><td>Обновить список</td><td><b>F5</b></td></tr>
-        <tr><td>Пересчитать суммы</td><td><b>F9</b></td></tr>
-        <tr><td>Ошибки расчетов</td><td><b>Ctrl+Shift+E</b></td></tr>
-        <tr><td>Скрыть нулевые столбцы</td><td><b>Ctrl+H</b></td></tr>
-        <tr><td>Просмотр справочников</td><td><b>Ctrl+R</b></td></tr>
-        <tr><td>Справочники конфигурации</td><td><b>Ctrl+D</b></td></tr>
-        <tr><td>Панель проектов</td><td><b>Ctrl+1</b></td></tr>
-        <tr><td>Полноэкранный режим</td><td><b>F11</b></td></tr>
-        </table>
-        """
-        msg = QMessageBox(self)
-        msg.setWindowTitle("Горячие клавиши")
-        msg.setText(shortcuts_text)
-        msg.setTextFormat(Qt.RichText)
-        msg.exec_()
+        # Окно создается один раз и переиспользуется
+        if self._shortcuts_msg is None:
+            self._shortcuts_msg = QMessageBox(self)
+            self._shortcuts_msg.setWindowTitle("Горячие клавиши")
+            self._shortcuts_msg.setTextFormat(Qt.RichText)
+            self._shortcuts_msg.setText(self._SHORTCUTS_HTML)
+        self._shortcuts_msg.exec_()
     
     def show_document_dialog(self):
         """Показать диалог формирования документов (делегирует к documents_ui)"""
@@ -1274,9 +1364,14 @@ class MainWindow(QMainWindow):
         """Обработка решения о бюджете (делегирует к documents_ui)"""
         self.documents_ui.parse_solution_document()
     
-    def open_file(self, file_path: str):
-        """Открыть файл в системе"""
-        if not file_path or not os.path.exists(file_path):
+    def open_file(self, file_path: str, checked: bool = False):
+        """Открыть файл в системе
+        
+        Args:
+            file_path: Путь к файлу
+            checked: Существование файла уже проверено вызывающим кодом
+        """
+        if not file_path or (not checked and not os.path.exists(file_path)):
             QMessageBox.warning(self, "Ошибка", f"Файл не найден: {file_path}")
             return
         
@@ -1284,10 +1379,16 @@ class MainWindow(QMainWindow):
             system = platform.system()
             if system == "Windows":
                 os.startfile(file_path)
-            elif system == "Darwin":  # macOS
-                subprocess.run(["open", file_path])
-            else:  # Linux
-                subprocess.run(["xdg-open", file_path])
+            else:
+                # Запускаем без ожидания завершения, чтобы не блокировать интерфейс
+                opener = "open" if system == "Darwin" else "xdg-open"  # macOS / Linux
+                subprocess.Popen(
+                    [opener, file_path],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
             self.status_bar.showMessage(f"Файл открыт: {file_path}")
         except Exception as e:
             logger.error(f"Ошибка открытия файла: {e}", exc_info=True)
@@ -1327,12 +1428,12 @@ class MainWindow(QMainWindow):
 
             file_path = getattr(revision, "file_path", None) if revision else None
             if file_path and os.path.exists(file_path):
-                self.open_file(file_path)
+                self.open_file(file_path, checked=True)
                 return
 
         # 2) Fallback: используем last_exported_file (как раньше), если он есть
         if self.last_exported_file and os.path.exists(self.last_exported_file):
-            self.open_file(self.last_exported_file)
+            self.open_file(self.last_exported_file, checked=True)
             return
 
         # 3) Если ничего не нашли — показываем понятное сообщение
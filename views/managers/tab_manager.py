@@ -1,20 +1,66 @@
 """Менеджер для работы с вкладками"""
+import logging
+from types import MappingProxyType
+
 from PyQt5.QtWidgets import QMenu, QStyle
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from logger import logger
 from views.widgets import DetachedTabWindow
-from PyQt5.QtWidgets import QApplication
 
 
 class TabManager:
     """Менеджер для управления вкладками (открепление/прикрепление)"""
     
+    # Позиции вкладок главного окна (для возврата открепленных вкладок);
+    # словарь только для чтения
+    _TAB_POSITIONS = MappingProxyType({
+        "Древовидные данные": 0,
+        "Метаданные": 1,
+        "Ошибки": 2,
+        "Просмотр формы": 3
+    })
+    
     def __init__(self, main_window):
         """
         Args:
             main_window: Ссылка на главное окно
         """
         self.main_window = main_window
+        # Названия вкладок, находящихся в главном окне (при запуске - все)
+        self._attached_names = set(self._TAB_POSITIONS)
+        # Иконки контекстного меню вкладок (стиль приложения не меняется)
+        style = main_window.style()
+        self._icon_attach = style.standardIcon(QStyle.SP_DialogApplyButton)
+        self._icon_detach = style.standardIcon(QStyle.SP_TitleBarNormalButton)
+        # Контекстное меню вкладок создается при первом показе и переиспользуется;
+        # текст и иконка единственного действия задаются перед показом
+        self._tab_menu = None
+        self._tab_action = None
+        self._pending_tab_name = None
+        # Защита от повторного вызова меню сразу после закрытия предыдущего
+        # (двойное срабатывание правого клика на тачпаде)
+        self._menu_guard = False
+    
+    def _ensure_tab_menu(self):
+        """Создание контекстного меню вкладок (однократно)"""
+        if self._tab_menu is not None:
+            return
+        self._tab_menu = QMenu(self.main_window)
+        self._tab_action = self._tab_menu.addAction("")
+        self._tab_menu.aboutToShow.connect(self._update_tab_action)
+    
+    def _update_tab_action(self):
+        """Настройка действия меню под вкладку, для которой оно открывается"""
+        if self._pending_tab_name in self.main_window.detached_windows:
+            self._tab_action.setText("Вернуть во вкладки")
+            self._tab_action.setIcon(self._icon_attach)
+        else:
+            self._tab_action.setText("Открыть в отдельном окне")
+            self._tab_action.setIcon(self._icon_detach)
+    
+    def _release_menu_guard(self):
+        """Снятие защиты от повторного вызова контекстного меню"""
+        self._menu_guard = False
     
     def show_tab_context_menu(self, position):
         """Показать контекстное меню для вкладок
@@ -22,37 +68,43 @@ class TabManager:
         Args:
             position: Позиция клика относительно QTabWidget
         """
+        if self._menu_guard:
+            return
+        tabs_panel = self.main_window.tabs_panel
+        
         # position - это позиция клика относительно QTabWidget
         # Проверяем, что клик был именно на tabBar
-        tab_bar = self.main_window.tabs_panel.tabBar()
-        tab_bar_pos = tab_bar.mapFrom(self.main_window.tabs_panel, position)
+        tab_bar = tabs_panel.tabBar()
+        tab_bar_pos = tab_bar.mapFrom(tabs_panel, position)
         tab_index = tab_bar.tabAt(tab_bar_pos)
         
         # Если не нашли вкладку по позиции, пробуем найти по текущей выбранной
         if tab_index < 0:
-            tab_index = self.main_window.tabs_panel.currentIndex()
+            tab_index = tabs_panel.currentIndex()
             if tab_index < 0:
                 return
         
-        tab_name = self.main_window.tabs_panel.tabText(tab_index)
+        tab_name = tabs_panel.tabText(tab_index)
         if not tab_name:
             return
         
-        menu = QMenu(self.main_window)
+        self._ensure_tab_menu()
         
+        self._pending_tab_name = tab_name
+        self._menu_guard = True
+        try:
+            action = self._tab_menu.exec_(tabs_panel.mapToGlobal(position))
+        finally:
+            self._pending_tab_name = None
+            QTimer.singleShot(150, self._release_menu_guard)
+        
+        if action != self._tab_action:
+            return
         # Проверяем, откреплена ли вкладка
         if tab_name in self.main_window.detached_windows:
-            attach_action = menu.addAction("Вернуть во вкладки")
-            attach_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_DialogApplyButton))
-            action = menu.exec_(self.main_window.tabs_panel.mapToGlobal(position))
-            if action == attach_action:
-                self.attach_tab(tab_name, None)
+            self.attach_tab(tab_name, None)
         else:
-            detach_action = menu.addAction("Открыть в отдельном окне")
-            detach_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_TitleBarNormalButton))
-            action = menu.exec_(self.main_window.tabs_panel.mapToGlobal(position))
-            if action == detach_action:
-                self.detach_tab(tab_index, tab_name)
+            self.detach_tab(tab_index, tab_name)
     
     def detach_tab(self, tab_index: int, tab_name: str):
         """Открепление вкладки в отдельное окно
@@ -61,20 +113,32 @@ class TabManager:
             tab_index: Индекс вкладки
             tab_name: Название вкладки
         """
+        tabs_panel = self.main_window.tabs_panel
         # Получаем виджет вкладки
-        tab_widget = self.main_window.tabs_panel.widget(tab_index)
+        tab_widget = tabs_panel.widget(tab_index)
         if not tab_widget:
             return
         
+        # Набор виджетов дерева меняется - сбрасываем кэш главного окна
+        self.main_window._tree_widgets_cache = None
+        
         # Сохраняем текущий размер виджета
         widget_size = tab_widget.size()
         
-        # Удаляем вкладку из главного окна (но не удаляем сам виджет)
-        self.main_window.tabs_panel.removeTab(tab_index)
+        # Удаляем вкладку из главного окна (но не удаляем сам виджет);
+        # на время изменения отключаем перерисовку панели вкладок
+        tabs_panel.setUpdatesEnabled(False)
+        try:
+            tabs_panel.removeTab(tab_index)
+        finally:
+            tabs_panel.setUpdatesEnabled(True)
+        self._attached_names.discard(tab_name)
+        if tab_name == "Метаданные":
+            self.main_window.metadata_panel.invalidate_widgets_cache()
         
-        # Убеждаемся, что виджет видим и имеет правильный размер
-        tab_widget.setParent(None)
-        tab_widget.setVisible(True)
+        # Восстанавливаем размер виджета. Родителя не сбрасываем и виджет здесь
+        # не показываем: без родителя он на мгновение стал бы отдельным окном,
+        # а DetachedTabWindow сам переназначит родителя и покажет его
         if widget_size.isValid() and widget_size.width() > 0 and widget_size.height() > 0:
             tab_widget.resize(widget_size)
         
@@ -94,17 +158,19 @@ class TabManager:
             tab_name: Название вкладки
             tab_widget: Виджет вкладки (опционально)
         """
-        logger.debug(f"attach_tab вызван для вкладки '{tab_name}'")
+        tabs_panel = self.main_window.tabs_panel
+        logger.debug("attach_tab вызван для вкладки '%s'", tab_name)
+        # Набор виджетов дерева меняется - сбрасываем кэш главного окна
+        self.main_window._tree_widgets_cache = None
         
         # Проверяем, есть ли эта вкладка в открепленных окнах
         if tab_name not in self.main_window.detached_windows:
             # Если вкладка уже не в словаре, возможно она уже была возвращена
             # Проверяем, не находится ли она уже в tabs_panel
-            for i in range(self.main_window.tabs_panel.count()):
-                if self.main_window.tabs_panel.tabText(i) == tab_name:
-                    logger.debug(f"Вкладка '{tab_name}' уже находится в tabs_panel")
-                    return
-            logger.warning(f"Вкладка '{tab_name}' не найдена в detached_windows и не найдена в tabs_panel")
+            if tab_name in self._attached_names:
+                logger.debug("Вкладка '%s' уже находится в tabs_panel", tab_name)
+                return
+            logger.warning("Вкладка '%s' не найдена в detached_windows и не найдена в tabs_panel", tab_name)
             return
         
         detached_window = self.main_window.detached_windows[tab_name]
@@ -114,7 +180,7 @@ class TabManager:
             tab_widget = detached_window.centralWidget()
         
         if not tab_widget:
-            logger.error(f"Не удалось получить виджет для вкладки '{tab_name}'")
+            logger.error("Не удалось получить виджет для вкладки '%s'", tab_name)
             # Если виджет не найден, просто удаляем запись
             try:
                 detached_window.setProperty("attaching", True)
@@ -125,11 +191,26 @@ class TabManager:
                 del self.main_window.detached_windows[tab_name]
             return
         
-        logger.debug(f"Виджет для вкладки '{tab_name}' получен: {type(tab_widget).__name__}")
+        # Виджет уже находится в панели вкладок - повторная вставка не нужна,
+        # достаточно закрыть устаревшее окно и показать вкладку
+        existing_index = tabs_panel.indexOf(tab_widget)
+        if existing_index >= 0:
+            detached_window.setProperty("attaching", True)
+            del self.main_window.detached_windows[tab_name]
+            self._attached_names.add(tab_name)
+            tabs_panel.setCurrentIndex(existing_index)
+            try:
+                detached_window.close()
+            except Exception as e:
+                logger.warning("Ошибка при закрытии окна: %s", e)
+            return
         
         # Сохраняем размер виджета
         widget_size = tab_widget.size()
-        logger.debug(f"Размер виджета: {widget_size.width()}x{widget_size.height()}")
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug("Виджет для вкладки '%s' получен: %s", tab_name, type(tab_widget).__name__)
+            logger.debug("Размер виджета: %sx%s", widget_size.width(), widget_size.height())
         
         # Устанавливаем флаг, чтобы closeEvent не вызывал attach_tab повторно
         detached_window.setProperty("attaching", True)
@@ -140,17 +221,19 @@ class TabManager:
             del self.main_window.detached_windows[tab_name]
         
         # Определяем позицию вкладки по имени
-        tab_positions = {
-            "Древовидные данные": 0,
-            "Метаданные": 1,
-            "Ошибки": 2,
-            "Просмотр формы": 3
-        }
-        position = tab_positions.get(tab_name, self.main_window.tabs_panel.count())
-        
-        logger.debug(f"Добавление вкладки '{tab_name}' в позицию {position}, текущее количество вкладок: {self.main_window.tabs_panel.count()}")
-        logger.debug(f"Виджет имеет layout: {tab_widget.layout() is not None}")
-        logger.debug(f"Виджет имеет родителя: {tab_widget.parent() is not None}, тип родителя: {type(tab_widget.parent()).__name__ if tab_widget.parent() else 'None'}")
+        position = TabManager._TAB_POSITIONS.get(tab_name, tabs_panel.count())
+        
+        if debug_enabled:
+            parent = tab_widget.parent()
+            logger.debug(
+                "Добавление вкладки '%s' в позицию %s, текущее количество вкладок: %s",
+                tab_name, position, tabs_panel.count()
+            )
+            logger.debug("Виджет имеет layout: %s", tab_widget.layout() is not None)
+            logger.debug(
+                "Виджет имеет родителя: %s, тип родителя: %s",
+                parent is not None, type(parent).__name__ if parent else 'None'
+            )
         
         # ВАЖНО: Не удаляем виджет из окна до добавления в tabs_panel
         # QTabWidget.insertTab() автоматически установит правильного родителя
@@ -164,47 +247,60 @@ class TabManager:
             tab_widget.resize(widget_size)
         
         # Добавляем вкладку обратно в главное окно
-        # insertTab автоматически установит правильного родителя и удалит из старого
+        # insertTab автоматически установит правильного родителя и удалит из старого.
+        # Перерисовка панели вкладок отключена до конца изменений: включение
+        # обновлений само запланирует одну перерисовку
+        tabs_panel.setUpdatesEnabled(False)
         try:
-            inserted_index = self.main_window.tabs_panel.insertTab(position, tab_widget, tab_name)
-            logger.debug(f"Вкладка вставлена на индекс {inserted_index}, новое количество вкладок: {self.main_window.tabs_panel.count()}")
+            inserted_index = tabs_panel.insertTab(position, tab_widget, tab_name)
+            self._attached_names.add(tab_name)
+            if tab_name == "Метаданные":
+                self.main_window.metadata_panel.invalidate_widgets_cache()
+            if debug_enabled:
+                logger.debug(
+                    "Вкладка вставлена на индекс %s, новое количество вкладок: %s",
+                    inserted_index, tabs_panel.count()
+                )
             
             # Проверяем, что вкладка действительно добавлена
-            if inserted_index >= 0 and inserted_index < self.main_window.tabs_panel.count():
-                actual_tab_name = self.main_window.tabs_panel.tabText(inserted_index)
-                logger.debug(f"Проверка: вкладка на индексе {inserted_index} имеет имя '{actual_tab_name}'")
-                
-                # Проверяем, что виджет действительно установлен как виджет вкладки
-                widget_at_index = self.main_window.tabs_panel.widget(inserted_index)
-                logger.debug(f"Виджет на индексе {inserted_index}: {type(widget_at_index).__name__ if widget_at_index else 'None'}, совпадает с tab_widget: {widget_at_index == tab_widget}")
+            if inserted_index >= 0 and inserted_index < tabs_panel.count():
+                if debug_enabled:
+                    actual_tab_name = tabs_panel.tabText(inserted_index)
+                    logger.debug("Проверка: вкладка на индексе %s имеет имя '%s'", inserted_index, actual_tab_name)
+                    
+                    # Проверяем, что виджет действительно установлен как виджет вкладки
+                    widget_at_index = tabs_panel.widget(inserted_index)
+                    logger.debug(
+                        "Виджет на индексе %s: %s, совпадает с tab_widget: %s",
+                        inserted_index,
+                        type(widget_at_index).__name__ if widget_at_index else 'None',
+                        widget_at_index == tab_widget
+                    )
                 
                 # Убеждаемся, что вкладка видна
-                self.main_window.tabs_panel.setCurrentIndex(inserted_index)
-                self.main_window.tabs_panel.setTabVisible(inserted_index, True)
+                tabs_panel.setCurrentIndex(inserted_index)
+                tabs_panel.setTabVisible(inserted_index, True)
                 
                 # Теперь можно удалить виджет из окна, так как он уже в tabs_panel
                 try:
                     detached_window.setCentralWidget(None)
                     logger.debug("Центральный виджет удален из окна после добавления в tabs_panel")
                 except Exception as e:
-                    logger.warning(f"Ошибка при удалении центрального виджета: {e}")
-                
-                # Принудительно обновляем отображение
-                tab_widget.show()
-                tab_widget.update()
-                self.main_window.tabs_panel.update()
-                
-                # Принудительно перерисовываем
-                QApplication.processEvents()
+                    logger.warning("Ошибка при удалении центрального виджета: %s", e)
             else:
-                logger.error(f"Ошибка: вкладка не была добавлена правильно. inserted_index={inserted_index}, count={self.main_window.tabs_panel.count()}")
+                logger.error(
+                    "Ошибка: вкладка не была добавлена правильно. inserted_index=%s, count=%s",
+                    inserted_index, tabs_panel.count()
+                )
         except Exception as e:
-            logger.error(f"Ошибка при добавлении вкладки в tabs_panel: {e}", exc_info=True)
+            logger.error("Ошибка при добавлении вкладки в tabs_panel: %s", e, exc_info=True)
+        finally:
+            tabs_panel.setUpdatesEnabled(True)
         
         # Закрываем окно после того, как вкладка добавлена
         try:
             detached_window.close()
         except Exception as e:
-            logger.warning(f"Ошибка при закрытии окна: {e}")
+            logger.warning("Ошибка при закрытии окна: %s", e)
         
-        logger.info(f"Вкладка '{tab_name}' успешно возвращена в главное окно на позицию {position}")
+        logger.info("Вкладка '%s' успешно возвращена в главное окно на позицию %s", tab_name, position)
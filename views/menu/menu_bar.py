@@ -1,163 +1,241 @@
 """Меню-бар приложения"""
 from PyQt5.QtWidgets import (QAction, QWidget, QHBoxLayout, QLabel, 
                              QSpinBox, QWidgetAction)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QFont, QIcon
 from PyQt5.QtWidgets import QStyle
 
 
+# Кэш стандартных иконок стиля: ключ - значение перечисления QStyle.SP_*
+_ICON_CACHE = {}
+
+# Размеры, в которых иконки отрисовываются заранее (меню и панель инструментов)
+_ICON_SIZES = (QSize(16, 16), QSize(22, 22), QSize(32, 32))
+
+
+def _icon(style, sp):
+    """
+    Получение стандартной иконки стиля с кэшированием
+    
+    Args:
+        style: Стиль приложения (QStyle)
+        sp: Идентификатор стандартной иконки (QStyle.SP_*)
+    
+    Returns:
+        QIcon из кэша или созданная стилем иконка
+    """
+    icon = _ICON_CACHE.get(sp)
+    if icon is None:
+        # Растровые копии создаются один раз, чтобы отрисовка меню
+        # не обращалась к движку стиля за каждым изображением
+        standard = style.standardIcon(sp)
+        icon = QIcon()
+        for size in _ICON_SIZES:
+            pixmap = standard.pixmap(size)
+            if not pixmap.isNull():
+                icon.addPixmap(pixmap)
+        if icon.isNull():
+            icon = standard
+        _ICON_CACHE[sp] = icon
+    return icon
+
+
+def clear_icon_cache():
+    """Сброс кэша стандартных иконок (при смене стиля)"""
+    _ICON_CACHE.clear()
+
+
 class MenuBar:
     """Класс для создания меню-бара"""
     
+    # Описание действий меню: (текст, иконка QStyle.SP_*, сочетание клавиш,
+    # подсказка, обработчик). Обработчик - имя метода главного окна или
+    # кортеж (имя метода, аргументы...); None - разделитель
+    _FILE_ACTIONS = (
+        ("&Новый проект...", QStyle.SP_FileIcon, "Ctrl+N",
+         "Создать новый проект", "show_new_project_dialog"),
+        ("&Загрузить форму...", QStyle.SP_DirOpenIcon, "Ctrl+O",
+         "Загрузить файл формы", "load_form_file"),
+        None,
+        ("&Экспорт проверки...", QStyle.SP_DialogSaveButton, "Ctrl+E",
+         "Экспортировать форму с проверкой", "export_validation"),
+        None,
+        ("&Открыть файл...", QStyle.SP_DirOpenIcon, "Ctrl+Shift+O",
+         "Открыть файл (doc, docx, xls, xlsx)", "open_file_dialog"),
+    )
+    
+    _FILE_EXIT_ACTIONS = (
+        None,
+        ("&Выход", QStyle.SP_DialogCloseButton, "Ctrl+Q",
+         "Выход из приложения", "close"),
+    )
+    
+    _PROJECT_ACTIONS = (
+        ("&Редактировать проект...", QStyle.SP_FileDialogDetailedView, "Ctrl+P",
+         "Редактировать текущий проект", "edit_current_project"),
+        ("&Удалить проект", QStyle.SP_TrashIcon, "Ctrl+Delete",
+         "Удалить текущий проект", "delete_current_project"),
+        None,
+    )
+    
+    _REFERENCE_ACTIONS = (
+        ("&Загрузить справочник доходов...", QStyle.SP_DialogOpenButton, None,
+         "Загрузить справочник доходов", ("show_reference_dialog", "доходы")),
+        ("&Загрузить справочник источников...", QStyle.SP_DialogOpenButton, None,
+         "Загрузить справочник источников финансирования", ("show_reference_dialog", "источники")),
+        None,
+        ("&Просмотр справочников", QStyle.SP_FileDialogInfoView, "Ctrl+R",
+         "Открыть окно просмотра справочников", "show_reference_viewer"),
+        None,
+        ("&Справочники конфигурации...", QStyle.SP_FileDialogListView, "Ctrl+D",
+         "Редактировать справочники конфигурации (годы, МО, типы форм, периоды)", "show_config_dictionaries"),
+        ("&Управление справочниками...", QStyle.SP_FileDialogListView, None,
+         "Управление справочниками (коды доходов, расходов, ГРБС и т.д.)", "show_references_management"),
+    )
+    
+    _HELP_ACTIONS = (
+        ("&О программе", QStyle.SP_MessageBoxInformation, None,
+         "Информация о программе", "show_about"),
+        None,
+        ("&Горячие клавиши", QStyle.SP_FileDialogInfoView, None,
+         "Список горячих клавиш", "show_shortcuts"),
+    )
+    
     def __init__(self, main_window):
         """
         Args:
             main_window: Ссылка на главное окно для доступа к обработчикам
         """
         self.main_window = main_window
+        # Действия и виджеты меню, к которым обращаются извне (по имени)
+        self._widget_registry = {}
+    
+    def get(self, name):
+        """
+        Получение действия или виджета меню по имени
+        
+        Args:
+            name: Имя в реестре ('open_last_file', 'font_size', 'header_font_size')
+        
+        Returns:
+            QAction/QWidget или None, если меню еще не построено
+        """
+        return self._widget_registry.get(name)
     
     def create_menu_bar(self):
         """Создание меню-бара"""
         menubar = self.main_window.menuBar()
         
-        # ========== Меню "Файл" ==========
-        file_menu = menubar.addMenu("&Файл")
-        
-        new_project_action = QAction("&Новый проект...", self.main_window)
-        new_project_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileIcon))
-        new_project_action.setShortcut("Ctrl+N")
-        new_project_action.setStatusTip("Создать новый проект")
-        new_project_action.triggered.connect(self.main_window.show_new_project_dialog)
-        file_menu.addAction(new_project_action)
-        
-        load_form_action = QAction("&Загрузить форму...", self.main_window)
-        load_form_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_DirOpenIcon))
-        load_form_action.setShortcut("Ctrl+O")
-        load_form_action.setStatusTip("Загрузить файл формы")
-        load_form_action.triggered.connect(self.main_window.load_form_file)
-        file_menu.addAction(load_form_action)
-        
-        file_menu.addSeparator()
-        
-        export_action = QAction("&Экспорт проверки...", self.main_window)
-        export_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_DialogSaveButton))
-        export_action.setShortcut("Ctrl+E")
-        export_action.setStatusTip("Экспортировать форму с проверкой")
-        export_action.triggered.connect(self.main_window.export_validation)
-        file_menu.addAction(export_action)
-        
-        file_menu.addSeparator()
-        
-        # Открытие файлов
-        open_file_action = QAction("&Открыть файл...", self.main_window)
-        open_file_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_DirOpenIcon))
-        open_file_action.setShortcut("Ctrl+Shift+O")
-        open_file_action.setStatusTip("Открыть файл (doc, docx, xls, xlsx)")
-        open_file_action.triggered.connect(self.main_window.open_file_dialog)
-        file_menu.addAction(open_file_action)
+        # Меню с горячими клавишами наполняются сразу: сочетание клавиш
+        # QAction срабатывает только после добавления действия в виджет
+        self._build_file_menu(menubar.addMenu("&Файл"))
+        self._build_project_menu(menubar.addMenu("&Проект"))
+        
+        # (действия для раздела данных сейчас управляются непосредственно формой)
+        menubar.addMenu("&Данные")
+        
+        self._build_reference_menu(menubar.addMenu("&Справочники"))
+        self._build_view_menu(menubar.addMenu("&Вид"))
+        
+        # Меню без горячих клавиш наполняется при первом открытии
+        help_menu = menubar.addMenu("&Справка")
+        help_menu.aboutToShow.connect(
+            lambda m=help_menu: self._populate_once(m, self._build_help_menu)
+        )
+    
+    def _populate_once(self, menu, builder):
+        """
+        Однократное наполнение меню при первом показе
+        
+        Args:
+            menu: Меню (QMenu)
+            builder: Метод, добавляющий действия в меню
+        """
+        if menu.property("built"):
+            return
+        menu.setProperty("built", True)
+        menu.aboutToShow.disconnect()
+        builder(menu)
+    
+    def _add_actions(self, menu, actions, style):
+        """
+        Добавление в меню действий по таблице описаний
+        
+        Args:
+            menu: Меню (QMenu)
+            actions: Кортеж описаний действий (см. _FILE_ACTIONS)
+            style: Стиль приложения для получения иконок
+        """
+        main_window = self.main_window
+        for entry in actions:
+            if entry is None:
+                menu.addSeparator()
+                continue
+            text, sp, shortcut, status_tip, handler = entry
+            action = QAction(text, main_window)
+            action.setIcon(_icon(style, sp))
+            if shortcut:
+                action.setShortcut(shortcut)
+            action.setStatusTip(status_tip)
+            if isinstance(handler, tuple):
+                method = getattr(main_window, handler[0])
+                args = handler[1:]
+                action.triggered.connect(lambda checked=False, method=method, args=args: method(*args))
+            else:
+                action.triggered.connect(getattr(main_window, handler))
+            menu.addAction(action)
+    
+    def _build_file_menu(self, menu):
+        """Наполнение меню «Файл»"""
+        main_window = self.main_window
+        style = main_window.style()
+        self._add_actions(menu, self._FILE_ACTIONS, style)
         
         # Открыть последний экспортированный файл
-        self.main_window.open_last_file_action = QAction("Открыть последний экспортированный файл", self.main_window)
-        self.main_window.open_last_file_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogStart))
-        self.main_window.open_last_file_action.setStatusTip("Открыть последний экспортированный файл")
-        self.main_window.open_last_file_action.setEnabled(False)
-        self.main_window.open_last_file_action.triggered.connect(self.main_window.open_last_exported_file)
-        file_menu.addAction(self.main_window.open_last_file_action)
-        
-        file_menu.addSeparator()
-        
-        exit_action = QAction("&Выход", self.main_window)
-        exit_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_DialogCloseButton))
-        exit_action.setShortcut("Ctrl+Q")
-        exit_action.setStatusTip("Выход из приложения")
-        exit_action.triggered.connect(self.main_window.close)
-        file_menu.addAction(exit_action)
-        
-        # ========== Меню "Проект" ==========
-        project_menu = menubar.addMenu("&Проект")
-        
-        edit_project_action = QAction("&Редактировать проект...", self.main_window)
-        edit_project_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogDetailedView))
-        edit_project_action.setShortcut("Ctrl+P")
-        edit_project_action.setStatusTip("Редактировать текущий проект")
-        edit_project_action.triggered.connect(self.main_window.edit_current_project)
-        project_menu.addAction(edit_project_action)
-        
-        delete_project_action = QAction("&Удалить проект", self.main_window)
-        delete_project_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_TrashIcon))
-        delete_project_action.setShortcut("Ctrl+Delete")
-        delete_project_action.setStatusTip("Удалить текущий проект")
-        delete_project_action.triggered.connect(self.main_window.delete_current_project)
-        project_menu.addAction(delete_project_action)
-        
-        project_menu.addSeparator()
-        
-        refresh_projects_action = QAction("&Обновить список", self.main_window)
-        refresh_projects_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_BrowserReload))
+        open_last_file_action = QAction("Открыть последний экспортированный файл", main_window)
+        open_last_file_action.setIcon(_icon(style, QStyle.SP_FileDialogStart))
+        open_last_file_action.setStatusTip("Открыть последний экспортированный файл")
+        open_last_file_action.setEnabled(False)
+        open_last_file_action.triggered.connect(main_window.open_last_exported_file)
+        menu.addAction(open_last_file_action)
+        self._widget_registry['open_last_file'] = open_last_file_action
+        
+        self._add_actions(menu, self._FILE_EXIT_ACTIONS, style)
+    
+    def _build_project_menu(self, menu):
+        """Наполнение меню «Проект»"""
+        main_window = self.main_window
+        style = main_window.style()
+        self._add_actions(menu, self._PROJECT_ACTIONS, style)
+        
+        refresh_projects_action = QAction("&Обновить список", main_window)
+        refresh_projects_action.setIcon(_icon(style, QStyle.SP_BrowserReload))
         refresh_projects_action.setShortcut("F5")
         refresh_projects_action.setStatusTip("Обновить список проектов")
         refresh_projects_action.triggered.connect(
-            lambda: self.main_window.controller.projects_updated.emit(
-                self.main_window.controller.project_controller.load_projects()
+            lambda: main_window.controller.projects_updated.emit(
+                main_window.controller.project_controller.load_projects()
             )
         )
-        project_menu.addAction(refresh_projects_action)
-        
-        # ========== Меню "Данные" ==========
-        data_menu = menubar.addMenu("&Данные")
-        # (действия для раздела данных сейчас управляются непосредственно формой)
+        menu.addAction(refresh_projects_action)
+    
+    def _build_reference_menu(self, menu):
+        """Наполнение меню «Справочники»"""
+        self._add_actions(menu, self._REFERENCE_ACTIONS, self.main_window.style())
+    
+    def _build_view_menu(self, menu):
+        """Наполнение меню «Вид»"""
+        main_window = self.main_window
         
-        # ========== Меню "Справочники" ==========
-        reference_menu = menubar.addMenu("&Справочники")
-        
-        load_income_ref_action = QAction("&Загрузить справочник доходов...", self.main_window)
-        load_income_ref_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_DialogOpenButton))
-        load_income_ref_action.setStatusTip("Загрузить справочник доходов")
-        load_income_ref_action.triggered.connect(lambda: self.main_window.show_reference_dialog("доходы"))
-        reference_menu.addAction(load_income_ref_action)
-        
-        load_sources_ref_action = QAction("&Загрузить справочник источников...", self.main_window)
-        load_sources_ref_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_DialogOpenButton))
-        load_sources_ref_action.setStatusTip("Загрузить справочник источников финансирования")
-        load_sources_ref_action.triggered.connect(lambda: self.main_window.show_reference_dialog("источники"))
-        reference_menu.addAction(load_sources_ref_action)
-        
-        reference_menu.addSeparator()
-        
-        show_references_action = QAction("&Просмотр справочников", self.main_window)
-        show_references_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogInfoView))
-        show_references_action.setShortcut("Ctrl+R")
-        show_references_action.setStatusTip("Открыть окно просмотра справочников")
-        show_references_action.triggered.connect(self.main_window.show_reference_viewer)
-        reference_menu.addAction(show_references_action)
-        
-        reference_menu.addSeparator()
-        
-        config_dicts_action = QAction("&Справочники конфигурации...", self.main_window)
-        config_dicts_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogListView))
-        config_dicts_action.setShortcut("Ctrl+D")
-        config_dicts_action.setStatusTip("Редактировать справочники конфигурации (годы, МО, типы форм, периоды)")
-        config_dicts_action.triggered.connect(self.main_window.show_config_dictionaries)
-        reference_menu.addAction(config_dicts_action)
-        
-        manage_refs_action = QAction("&Управление справочниками...", self.main_window)
-        manage_refs_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogListView))
-        manage_refs_action.setStatusTip("Управление справочниками (коды доходов, расходов, ГРБС и т.д.)")
-        manage_refs_action.triggered.connect(self.main_window.show_references_management)
-        reference_menu.addAction(manage_refs_action)
-        
-        # ========== Меню "Вид" ==========
-        view_menu = menubar.addMenu("&Вид")
-        
-        toggle_projects_panel_action = QAction("&Панель проектов", self.main_window)
+        toggle_projects_panel_action = QAction("&Панель проектов", main_window)
         toggle_projects_panel_action.setCheckable(True)
         toggle_projects_panel_action.setChecked(True)
         toggle_projects_panel_action.setShortcut("Ctrl+1")
         toggle_projects_panel_action.setStatusTip("Показать/скрыть панель проектов")
-        toggle_projects_panel_action.triggered.connect(self.main_window.toggle_projects_panel)
-        view_menu.addAction(toggle_projects_panel_action)
+        toggle_projects_panel_action.triggered.connect(main_window.toggle_projects_panel)
+        menu.addAction(toggle_projects_panel_action)
         
-        view_menu.addSeparator()
+        menu.addSeparator()
         
         # Управление размером шрифта данных
         font_size_widget = QWidget()
@@ -165,16 +243,17 @@ class MenuBar:
         font_size_layout.setContentsMargins(10, 5, 10, 5)
         font_size_label = QLabel("Размер шрифта данных:")
         font_size_layout.addWidget(font_size_label)
-        self.main_window.font_size_spinbox = QSpinBox()
-        self.main_window.font_size_spinbox.setMinimum(6)
-        self.main_window.font_size_spinbox.setMaximum(20)
-        self.main_window.font_size_spinbox.setValue(self.main_window.font_size)
-        self.main_window.font_size_spinbox.setSuffix(" пт")
-        self.main_window.font_size_spinbox.valueChanged.connect(self.main_window.on_font_size_changed)
-        font_size_layout.addWidget(self.main_window.font_size_spinbox)
-        font_size_action = QWidgetAction(self.main_window)
+        font_size_spinbox = QSpinBox()
+        font_size_spinbox.setMinimum(6)
+        font_size_spinbox.setMaximum(20)
+        font_size_spinbox.setValue(main_window.font_size)
+        font_size_spinbox.setSuffix(" пт")
+        font_size_spinbox.valueChanged.connect(main_window.on_font_size_changed)
+        font_size_layout.addWidget(font_size_spinbox)
+        self._widget_registry['font_size'] = font_size_spinbox
+        font_size_action = QWidgetAction(main_window)
         font_size_action.setDefaultWidget(font_size_widget)
-        view_menu.addAction(font_size_action)
+        menu.addAction(font_size_action)
         
         # Управление размером шрифта заголовков
         header_font_size_widget = QWidget()
@@ -182,39 +261,27 @@ class MenuBar:
         header_font_size_layout.setContentsMargins(10, 5, 10, 5)
         header_font_size_label = QLabel("Размер шрифта заголовков:")
         header_font_size_layout.addWidget(header_font_size_label)
-        self.main_window.header_font_size_spinbox = QSpinBox()
-        self.main_window.header_font_size_spinbox.setMinimum(6)
-        self.main_window.header_font_size_spinbox.setMaximum(20)
-        self.main_window.header_font_size_spinbox.setValue(self.main_window.header_font_size)
-        self.main_window.header_font_size_spinbox.setSuffix(" пт")
-        self.main_window.header_font_size_spinbox.valueChanged.connect(self.main_window.on_header_font_size_changed)
-        header_font_size_layout.addWidget(self.main_window.header_font_size_spinbox)
-        header_font_size_action = QWidgetAction(self.main_window)
+        header_font_size_spinbox = QSpinBox()
+        header_font_size_spinbox.setMinimum(6)
+        header_font_size_spinbox.setMaximum(20)
+        header_font_size_spinbox.setValue(main_window.header_font_size)
+        header_font_size_spinbox.setSuffix(" пт")
+        header_font_size_spinbox.valueChanged.connect(main_window.on_header_font_size_changed)
+        header_font_size_layout.addWidget(header_font_size_spinbox)
+        self._widget_registry['header_font_size'] = header_font_size_spinbox
+        header_font_size_action = QWidgetAction(main_window)
         header_font_size_action.setDefaultWidget(header_font_size_widget)
-        view_menu.addAction(header_font_size_action)
+        menu.addAction(header_font_size_action)
         
-        view_menu.addSeparator()
+        menu.addSeparator()
         
-        fullscreen_action = QAction("&Полноэкранный режим", self.main_window)
+        fullscreen_action = QAction("&Полноэкранный режим", main_window)
         fullscreen_action.setShortcut("F11")
         fullscreen_action.setCheckable(True)
         fullscreen_action.setStatusTip("Переключить полноэкранный режим")
-        fullscreen_action.triggered.connect(self.main_window.toggle_fullscreen)
-        view_menu.addAction(fullscreen_action)
-        
-        # ========== Меню "Справка" ==========
-        help_menu = menubar.addMenu("&Справка")
-        
-        about_action = QAction("&О программе", self.main_window)
-        about_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_MessageBoxInformation))
-        about_action.setStatusTip("Информация о программе")
-        about_action.triggered.connect(self.main_window.show_about)
-        help_menu.addAction(about_action)
-        
-        help_menu.addSeparator()
-        
-        shortcuts_action = QAction("&Горячие клавиши", self.main_window)
-        shortcuts_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogInfoView))
-        shortcuts_action.setStatusTip("Список горячих клавиш")
-        shortcuts_action.triggered.connect(self.main_window.show_shortcuts)
-        help_menu.addAction(shortcuts_action)
+        fullscreen_action.triggered.connect(main_window.toggle_fullscreen)
+        menu.addAction(fullscreen_action)
+    
+    def _build_help_menu(self, menu):
+        """Наполнение меню «Справка»"""
+        self._add_actions(menu, self._HELP_ACTIONS, self.main_window.style())
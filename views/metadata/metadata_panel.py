@@ -1,4 +1,7 @@
 """Панель метаданных"""
+from html import escape
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QTextEdit
 
 
@@ -12,57 +15,99 @@ class MetadataPanel:
         """
         self.main_window = main_window
         self.controller = main_window.controller
+        # Кэш виджетов метаданных (сбрасывается при откреплении/возврате вкладки)
+        self._widgets_cache = None
+        # Последний выведенный HTML и список виджетов, в которые он выведен
+        self._last_metadata_html = None
+        self._last_metadata_widgets = None
+        # Словарь метаданных, из которого собран последний HTML, и его размер
+        self._last_meta_info = None
+        self._last_meta_len = 0
+        # Отложенная загрузка: несколько вызовов за один проход цикла
+        # событий объединяются, выводится последний переданный проект
+        self._pending_project = None
+        self._refresh_timer = QTimer(main_window)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._do_load_metadata)
     
     def load_metadata(self, project):
-        """Загрузка метаданных для выбранной ревизии"""
+        """
+        Загрузка метаданных для выбранной ревизии (отложенная)
+        
+        Args:
+            project: Проект, метаданные которого нужно показать
+        """
+        self._pending_project = project
+        self._refresh_timer.start()
+    
+    def _do_load_metadata(self):
+        """Вывод метаданных последнего переданного проекта"""
+        project = self._pending_project
+        self._pending_project = None
+        
         # Метаданные должны быть только у ревизии, а не у проекта
         # Проверяем, что загружена ревизия (current_revision_id установлен)
         rev_id = getattr(self.controller, "current_revision_id", None)
         
-        # Получаем все виджеты метаданных
-        metadata_widgets = self._get_metadata_widgets()
+        # Метаданные берём из данных проекта (которые загружаются из ревизии);
+        # если ревизия не загружена или метаданных нет, виджеты очищаются
+        meta_info = None
+        if rev_id and project and project.data:
+            meta_info = project.data.get('meta_info') or {}
         
-        if not rev_id:
-            # Если ревизия не загружена, метаданные не отображаем
-            for metadata_widget in metadata_widgets:
-                metadata_widget.setHtml("")
-            return
-        
-        # Метаданные берём из данных проекта (которые загружаются из ревизии)
-        if not project or not project.data:
-            for metadata_widget in metadata_widgets:
-                metadata_widget.setHtml("")
-            return
+        widgets = self._get_metadata_widgets()
         
-        meta_info = project.data.get('meta_info', {})
-        if not meta_info:
-            for metadata_widget in metadata_widgets:
-                metadata_widget.setHtml("")
+        # Тот же словарь метаданных уже выведен в те же виджеты -
+        # HTML не собираем заново (повторный выбор той же ревизии)
+        if (meta_info is not None and meta_info is self._last_meta_info
+                and len(meta_info) == self._last_meta_len
+                and widgets is self._last_metadata_widgets):
             return
         
         metadata_text = ""
-        for key, value in meta_info.items():
-            metadata_text += f"<b>{key}:</b> {value}<br>"
+        if meta_info:
+            metadata_text = "".join(
+                f"<b>{escape(str(key))}:</b> {escape(str(value))}<br>"
+                for key, value in meta_info.items()
+            )
+        
+        self._last_meta_info = meta_info
+        self._last_meta_len = len(meta_info) if meta_info is not None else 0
         
-        # Обновляем все виджеты метаданных
-        for metadata_widget in metadata_widgets:
+        # Обновляем все виджеты метаданных (список виджетов получаем один раз);
+        # setHtml перестраивает документ, поэтому повторный вывод того же
+        # текста в те же виджеты пропускаем
+        if metadata_text == self._last_metadata_html and widgets is self._last_metadata_widgets:
+            return
+        for metadata_widget in widgets:
             metadata_widget.setHtml(metadata_text)
+        self._last_metadata_html = metadata_text
+        self._last_metadata_widgets = widgets
+    
+    def invalidate_widgets_cache(self):
+        """Сброс кэша виджетов метаданных (вкладка откреплена или возвращена)"""
+        self._widgets_cache = None
     
     def _get_metadata_widgets(self):
         """Получить все виджеты метаданных (в главном окне и открепленных)"""
+        if self._widgets_cache is not None:
+            return self._widgets_cache
+        
         widgets = []
         # Виджет в главном окне
         if hasattr(self.main_window, 'metadata_text') and self.main_window.metadata_text:
             widgets.append(self.main_window.metadata_text)
         
-        # Виджеты в открепленных окнах
-        if hasattr(self.main_window, 'detached_windows') and "Метаданные" in self.main_window.detached_windows:
-            detached_window = self.main_window.detached_windows["Метаданные"]
+        # Виджеты в открепленных окнах: обход дочерних виджетов нужен,
+        # только если вкладка метаданных откреплена
+        detached_window = self.main_window.detached_windows.get("Метаданные")
+        if detached_window is not None:
             tab_widget = detached_window.get_tab_widget()
             if tab_widget:
-                from PyQt5.QtWidgets import QTextEdit
                 for child in tab_widget.findChildren(QTextEdit):
                     if child not in widgets:
                         widgets.append(child)
         
+        self._widgets_cache = widgets
         return widgets
@@ -1,4 +1,6 @@
 """Панель проектов"""
+import logging
+
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QTreeWidget, QTreeWidgetItem, QMenu,
                              QMessageBox)
@@ -7,6 +9,37 @@ from PyQt5.QtGui import QFont
 from logger import logger
 
 
+# Значок статуса ревизии в дереве проектов
+_STATUS_ICONS = {"calculated": "✅"}
+
+# Роль с типом узла дерева проектов ("year", "project", "form", "period",
+# "revision"); у заглушек тип не задан
+NODE_TYPE_ROLE = Qt.UserRole + 2
+
+
+def _resolve_ids(item):
+    """
+    Поиск project_id/revision_id вверх по дереву (в т.ч. при клике на заглушки)
+
+    Args:
+        item: Узел дерева проектов
+
+    Returns:
+        Кортеж (project_id, revision_id); отсутствующие значения — None
+    """
+    proj_id = None
+    rev_id = None
+    cur = item
+    # Обход прекращается, как только найдены оба идентификатора
+    while cur is not None and (proj_id is None or rev_id is None):
+        if proj_id is None:
+            proj_id = cur.data(0, Qt.UserRole)
+        if rev_id is None:
+            rev_id = cur.data(0, Qt.UserRole + 1)
+        cur = cur.parent()
+    return proj_id, rev_id
+
+
 class ProjectsPanel:
     """Класс для управления панелью проектов"""
     
@@ -17,6 +50,24 @@ class ProjectsPanel:
         """
         self.main_window = main_window
         self.controller = main_window.controller
+        # Контекстное меню дерева создается при первом показе и переиспользуется;
+        # перед показом остаются видимыми только действия для выбранного узла
+        self._context_menu = None
+        self._edit_project_action = None
+        self._delete_project_action = None
+        self._edit_revision_action = None
+        self._delete_revision_action = None
+    
+    def _ensure_context_menu(self):
+        """Создание контекстного меню дерева проектов (однократно)"""
+        if self._context_menu is not None:
+            return
+        menu = QMenu(self.main_window)
+        self._edit_revision_action = menu.addAction("Редактировать ревизию")
+        self._delete_revision_action = menu.addAction("Удалить ревизию")
+        self._edit_project_action = menu.addAction("Редактировать проект")
+        self._delete_project_action = menu.addAction("Удалить проект")
+        self._context_menu = menu
     
     def create_projects_panel(self) -> QWidget:
         """Создание панели проектов"""
@@ -87,110 +138,107 @@ class ProjectsPanel:
     
     def update_projects_list(self, _projects):
         """Обновление дерева проектов по новой архитектуре MainController.build_project_tree"""
-        self.projects_tree.clear()
-
         # Получаем структурированные данные от контроллера
         tree_data = self.controller.build_project_tree()
 
+        # На время перестроения отключаем перерисовку, сигналы и сортировку
+        # дерева (включение обновлений само запланирует одну перерисовку)
+        sorting_enabled = self.projects_tree.isSortingEnabled()
+        self.projects_tree.setUpdatesEnabled(False)
+        self.projects_tree.blockSignals(True)
+        self.projects_tree.setSortingEnabled(False)
+        try:
+            self._populate_projects_tree(tree_data)
+        finally:
+            self.projects_tree.setSortingEnabled(sorting_enabled)
+            self.projects_tree.blockSignals(False)
+            self.projects_tree.setUpdatesEnabled(True)
+
+    def _populate_projects_tree(self, tree_data):
+        """
+        Заполнение дерева проектов
+
+        Args:
+            tree_data: Структура Год -> Проект -> Форма -> Период -> Ревизия
+                       (результат MainController.build_project_tree)
+        """
+        self.projects_tree.clear()
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        # Заглушки не несут данных: создаем по образцу и копируем через clone()
+        no_periods_proto = QTreeWidgetItem(["Нет периодов"])
+        no_revisions_proto = QTreeWidgetItem(["Нет ревизий"])
+
+        # Поддеревья собираются вне дерева (потомки создаются сразу с родителем)
+        # и добавляются в дерево одним вызовом addTopLevelItems
+        year_items = []
         for year_entry in tree_data:
-            year_label = f"Год {year_entry['year']}"
-            year_item = QTreeWidgetItem([year_label])
-            self.projects_tree.addTopLevelItem(year_item)
+            year_item = QTreeWidgetItem([f"Год {year_entry['year']}"])
+            year_item.setData(0, NODE_TYPE_ROLE, "year")
+            year_items.append(year_item)
 
             for proj in year_entry["projects"]:
-                proj_item = QTreeWidgetItem([proj["name"]])
+                proj_item = QTreeWidgetItem(year_item, [proj["name"]])
                 # Сохраняем ID проекта на уровне узла проекта
                 proj_item.setData(0, Qt.UserRole, proj["id"])
-                year_item.addChild(proj_item)
+                proj_item.setData(0, NODE_TYPE_ROLE, "project")
 
-                # Формы/периоды/ревизии (показываем даже пустые, с заглушками)
-                if proj.get("forms"):
-                    for form in proj["forms"]:
-                        form_label = f"{form['form_name']} ({form['form_code']})"
-                        form_item = QTreeWidgetItem([form_label])
-                        proj_item.addChild(form_item)
+                # Формы/периоды/ревизии (показываем даже пустые, с заглушками);
+                # контроллер всегда отдает списки, пустые при отсутствии данных
+                forms = proj["forms"]
+                if forms:
+                    for form in forms:
+                        form_item = QTreeWidgetItem(proj_item, [f"{form['form_name']} ({form['form_code']})"])
+                        form_item.setData(0, NODE_TYPE_ROLE, "form")
 
-                        periods = form.get("periods") or []
+                        periods = form["periods"]
                         if not periods:
-                            form_item.addChild(QTreeWidgetItem(["Нет периодов"]))
+                            form_item.addChild(no_periods_proto.clone())
                             continue
 
                         for period in periods:
                             period_label = period.get("period_name") or period.get("period_code") or "—"
-                            period_item = QTreeWidgetItem([period_label])
-                            form_item.addChild(period_item)
+                            period_item = QTreeWidgetItem(form_item, [period_label])
+                            period_item.setData(0, NODE_TYPE_ROLE, "period")
 
-                            revisions = period.get("revisions") or []
+                            revisions = period["revisions"]
                             if revisions:
                                 for rev in revisions:
-                                    status_icon = "✅" if rev["status"] == "calculated" else "📝"
-                                    rev_text = f"{status_icon} рев. {rev['revision']}"
-                                    rev_item = QTreeWidgetItem([rev_text])
+                                    status_icon = _STATUS_ICONS.get(rev["status"], "📝")
+                                    rev_item = QTreeWidgetItem(period_item, [f"{status_icon} рев. {rev['revision']}"])
                                     rev_item.setData(0, Qt.UserRole, rev.get("project_id"))
                                     revision_id = rev.get("revision_id")
                                     rev_item.setData(0, Qt.UserRole + 1, revision_id)
-                                    if revision_id:
+                                    rev_item.setData(0, NODE_TYPE_ROLE, "revision")
+                                    if revision_id and debug_enabled:
                                         logger.debug(
-                                            f"Сохранена ревизия в дереве: "
-                                            f"revision_id={revision_id}, project_id={rev.get('project_id')}, revision={rev.get('revision')}"
+                                            "Сохранена ревизия в дереве: revision_id=%s, project_id=%s, revision=%s",
+                                            revision_id, rev.get("project_id"), rev.get("revision")
                                         )
-                                    period_item.addChild(rev_item)
                             else:
-                                period_item.addChild(QTreeWidgetItem(["Нет ревизий"]))
+                                period_item.addChild(no_revisions_proto.clone())
                 else:
                     # Совсем нет форм — заглушка
-                    placeholder = QTreeWidgetItem(["Нет ревизий"])
-                    proj_item.addChild(placeholder)
-
-        # Разворачиваем верхние уровни (год, проект, форма, период)
-        # Ревизии остаются свернутыми по умолчанию
-        for i in range(self.projects_tree.topLevelItemCount()):
-            year_item = self.projects_tree.topLevelItem(i)
-            year_item.setExpanded(True)
-            for j in range(year_item.childCount()):
-                proj_item = year_item.child(j)
-                proj_item.setExpanded(True)
-                for k in range(proj_item.childCount()):
-                    form_item = proj_item.child(k)
-                    form_item.setExpanded(True)
-                    for m in range(form_item.childCount()):
-                        period_item = form_item.child(m)
-                        period_item.setExpanded(True)
+                    proj_item.addChild(no_revisions_proto.clone())
+
+        self.projects_tree.addTopLevelItems(year_items)
+
+        # Разворачиваем верхние уровни (год, проект, форма, период) одним вызовом;
+        # ревизии (уровень 4) остаются свернутыми
+        self.projects_tree.expandToDepth(3)
 
     def on_project_tree_double_clicked(self, item, column):
         """Обработка двойного клика по дереву проектов"""
-        # Поднимаемся по дереву, чтобы найти project_id/revision_id даже при клике на заглушки
-        def _resolve_ids(it):
-            proj_id = None
-            rev_id = None
-            cur = it
-            while cur:
-                if proj_id is None:
-                    proj_id = cur.data(0, Qt.UserRole)
-                if rev_id is None:
-                    rev_id = cur.data(0, Qt.UserRole + 1)
-                if proj_id is not None and rev_id is not None:
-                    break
-                cur = cur.parent()
-            return proj_id, rev_id
-
         project_id, revision_id = _resolve_ids(item)
         
         if not project_id:
             return
         
-        # Определяем, является ли узел ревизией (ревизия имеет revision_id и является дочерним элементом периода)
-        is_revision = False
-        if revision_id is not None and revision_id != 0:
-            # Проверяем структуру дерева: ревизия является дочерним элементом периода
-            parent = item.parent()
-            if parent and item.childCount() == 0:
-                # Период является дочерним элементом формы
-                grandparent = parent.parent() if parent else None
-                if grandparent:
-                    grandparent_text = grandparent.text(0).lower()
-                    if "форма" in grandparent_text or "(" in grandparent_text:
-                        is_revision = True
+        # Узел ревизии помечен при построении дерева и должен иметь revision_id
+        is_revision = (
+            revision_id is not None and revision_id != 0
+            and item.data(0, NODE_TYPE_ROLE) == "revision"
+        )
         
         if is_revision:
             # Подтягиваем параметры формы из ревизии для последующей загрузки файлов
@@ -218,50 +266,28 @@ class ProjectsPanel:
         if not project_id:
             return
 
-        # Определяем, является ли узел ревизией
-        # Структура дерева: Год -> Проект -> Форма -> Период -> Ревизия
-        # Ревизия - это узел, который является дочерним элементом периода
-        # и не имеет дочерних элементов
-        is_revision = False
-        
-        # Проверяем структуру дерева: ревизия является дочерним элементом периода
-        parent = item.parent()
-        if parent and item.childCount() == 0:
-            # Период является дочерним элементом формы
-            grandparent = parent.parent() if parent else None
-            if grandparent:
-                # Проверяем, что дедушка - это форма (содержит "форма" или "(")
-                grandparent_text = grandparent.text(0).lower()
-                if "форма" in grandparent_text or "(" in grandparent_text:
-                    # Родитель - период, значит текущий узел - ревизия
-                    is_revision = True
-
-        menu = QMenu()
-        edit_action = None
-        edit_rev_action = None
-        delete_rev_action = None
-        delete_project_action = None
-
-        # Если это узел ревизии
-        if is_revision:
-            # Для ревизии нужен revision_id для редактирования/удаления
-            if revision_id is not None:
-                edit_rev_action = menu.addAction("Редактировать ревизию")
-                delete_rev_action = menu.addAction("Удалить ревизию")
-            # Если revision_id не установлен (виртуальная ревизия из старой модели),
-            # действия редактирования/удаления недоступны
-        else:
-            # Для узла проекта (не ревизии) показываем действия проекта
-            edit_action = menu.addAction("Редактировать проект")
-            delete_project_action = menu.addAction("Удалить проект")
+        # Определяем, является ли узел ревизией (тип узла задан при построении дерева)
+        is_revision = item.data(0, NODE_TYPE_ROLE) == "revision"
 
-        action = menu.exec_(self.projects_tree.mapToGlobal(position))
+        self._ensure_context_menu()
+        # Для ревизии нужен revision_id для редактирования/удаления; если он не
+        # установлен (виртуальная ревизия из старой модели), действия недоступны
+        show_revision_actions = is_revision and revision_id is not None
+        self._edit_revision_action.setVisible(show_revision_actions)
+        self._delete_revision_action.setVisible(show_revision_actions)
+        # Для узла проекта (не ревизии) показываем действия проекта
+        self._edit_project_action.setVisible(not is_revision)
+        self._delete_project_action.setVisible(not is_revision)
 
-        if action == edit_action:
+        action = self._context_menu.exec_(self.projects_tree.mapToGlobal(position))
+        if action is None:
+            return
+
+        if action is self._edit_project_action:
             self.main_window.edit_project(project_id)
-        elif edit_rev_action is not None and action == edit_rev_action and revision_id:
+        elif action is self._edit_revision_action and revision_id:
             self.main_window.edit_revision(revision_id, project_id)
-        elif delete_rev_action is not None and action == delete_rev_action and revision_id:
+        elif action is self._delete_revision_action and revision_id:
             reply = QMessageBox.question(
                 self.main_window,
                 "Подтверждение",
@@ -269,10 +295,16 @@ class ProjectsPanel:
                 QMessageBox.Yes | QMessageBox.No,
             )
             if reply == QMessageBox.Yes:
-                self.controller.delete_form_revision(revision_id)
-                # После удаления ревизии обновляем дерево
-                self.update_projects_list(None)
-        elif action == delete_project_action:
+                period_item = item.parent()
+                if self.controller.delete_form_revision(revision_id, refresh_tree=False) and period_item is not None:
+                    # Удаляем из дерева только узел ревизии, без перестроения всего дерева
+                    period_item.takeChild(period_item.indexOfChild(item))
+                    if period_item.childCount() == 0:
+                        QTreeWidgetItem(period_item, ["Нет ревизий"])
+                else:
+                    # При ошибке удаления перестраиваем дерево по данным БД
+                    self.update_projects_list(None)
+        elif action is self._delete_project_action:
             reply = QMessageBox.question(
                 self.main_window,
                 "Подтверждение",
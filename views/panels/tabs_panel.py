@@ -1,12 +1,19 @@
 """Панель вкладок"""
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
                              QComboBox, QLabel, QCheckBox, QPushButton, QToolButton,
-                             QTextEdit, QTableWidget, QHeaderView, QMenu)
-from PyQt5.QtCore import Qt, QSize
+                             QTextEdit, QTableView, QHeaderView, QMenu)
+from PyQt5.QtCore import Qt, QSize, QStringListModel
 from PyQt5.QtGui import QFont
 from PyQt5.QtWidgets import QStyle
-from views.excel_viewer import ExcelViewer
-from views.widgets import WordWrapItemDelegate
+from views.errors import ErrorsTableModel
+from views.menu.menu_bar import _icon
+from views.widgets import TreeToolTipFilter
+
+
+# Списки выбора разделов и типов данных (модели комбобоксов строятся по ним
+# через QStringListModel, без создания QStandardItem на каждый пункт)
+_SECTIONS = ("Доходы", "Расходы", "Источники финансирования", "Консолидируемые расчеты")
+_DATA_TYPES = ("Утвержденный", "Исполненный", "Оба")
 
 
 class TabsPanel:
@@ -22,6 +29,7 @@ class TabsPanel:
     
     def create_tabs_panel(self) -> QWidget:
         """Создание панели с вкладками"""
+        style = self.main_window.style()
         tabs = QTabWidget()
         self.tabs_panel = tabs
         self.main_window.tabs_panel = tabs
@@ -40,7 +48,7 @@ class TabsPanel:
         tree_control_layout = QHBoxLayout()
         # Кнопки управления деревом (максимально компактные)
         self.expand_all_btn = QToolButton()
-        self.expand_all_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_ArrowDown))
+        self.expand_all_btn.setIcon(_icon(style, QStyle.SP_ArrowDown))
         self.expand_all_btn.setToolTip("Развернуть все узлы дерева")
         self.expand_all_btn.setIconSize(QSize(14, 14))
         self.expand_all_btn.setToolButtonStyle(Qt.ToolButtonIconOnly)
@@ -50,7 +58,7 @@ class TabsPanel:
         tree_control_layout.addWidget(self.expand_all_btn)
         
         self.collapse_all_btn = QToolButton()
-        self.collapse_all_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_ArrowUp))
+        self.collapse_all_btn.setIcon(_icon(style, QStyle.SP_ArrowUp))
         self.collapse_all_btn.setToolTip("Свернуть все узлы дерева")
         self.collapse_all_btn.setIconSize(QSize(14, 14))
         self.collapse_all_btn.setToolButtonStyle(Qt.ToolButtonIconOnly)
@@ -64,14 +72,14 @@ class TabsPanel:
         # Выбор раздела
         tree_control_layout.addWidget(QLabel("Раздел:"))
         self.section_combo = QComboBox()
-        self.section_combo.addItems(["Доходы", "Расходы", "Источники финансирования", "Консолидируемые расчеты"])
+        self.section_combo.setModel(QStringListModel(list(_SECTIONS), self.section_combo))
         self.section_combo.currentTextChanged.connect(self.main_window.on_section_changed)
         tree_control_layout.addWidget(self.section_combo)
         
         # Выбор типа данных
         tree_control_layout.addWidget(QLabel("Тип данных:"))
         self.data_type_combo = QComboBox()
-        self.data_type_combo.addItems(["Утвержденный", "Исполненный", "Оба"])
+        self.data_type_combo.setModel(QStringListModel(list(_DATA_TYPES), self.data_type_combo))
         self.data_type_combo.currentTextChanged.connect(self.main_window.on_data_type_changed)
         tree_control_layout.addWidget(self.data_type_combo)
         
@@ -87,7 +95,7 @@ class TabsPanel:
         
         # Кнопка пересчета
         self.recalculate_btn = QPushButton("Пересчитать")
-        self.recalculate_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_BrowserReload))
+        self.recalculate_btn.setIcon(_icon(style, QStyle.SP_BrowserReload))
         self.recalculate_btn.setToolTip("Пересчитать агрегированные суммы (F9)")
         self.recalculate_btn.setEnabled(False)
         self.recalculate_btn.clicked.connect(self.main_window.calculate_sums)
@@ -95,7 +103,7 @@ class TabsPanel:
         
         # Кнопка экспорта пересчитанной таблицы
         self.export_calculated_btn = QPushButton("Экспорт пересчитанной")
-        self.export_calculated_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_DialogSaveButton))
+        self.export_calculated_btn.setIcon(_icon(style, QStyle.SP_DialogSaveButton))
         self.export_calculated_btn.setToolTip("Экспортировать форму с пересчитанными значениями")
         self.export_calculated_btn.setEnabled(False)
         self.export_calculated_btn.clicked.connect(self.main_window.export_calculated_table)
@@ -103,7 +111,7 @@ class TabsPanel:
         
         # Кнопка показа ошибок расчетов
         self.show_errors_btn = QPushButton("Ошибки расчетов")
-        self.show_errors_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_MessageBoxWarning))
+        self.show_errors_btn.setIcon(_icon(style, QStyle.SP_MessageBoxWarning))
         self.show_errors_btn.setToolTip("Показать ошибки расчетов")
         self.show_errors_btn.setEnabled(False)
         self.show_errors_btn.clicked.connect(self.main_window.show_calculation_errors)
@@ -111,7 +119,7 @@ class TabsPanel:
         
         # Кнопка открытия файла
         self.open_file_btn = QPushButton("Открыть файл")
-        self.open_file_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_DirOpenIcon))
+        self.open_file_btn.setIcon(_icon(style, QStyle.SP_DirOpenIcon))
         self.open_file_btn.setToolTip("Открыть файл (doc, docx, xls, xlsx)")
         self.open_file_btn.setEnabled(True)
         self.open_file_btn.clicked.connect(self.main_window.open_file_dialog)
@@ -119,7 +127,7 @@ class TabsPanel:
         
         # Кнопка открытия последнего экспортированного файла
         self.open_last_file_btn = QPushButton("Открыть последний")
-        self.open_last_file_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogStart))
+        self.open_last_file_btn.setIcon(_icon(style, QStyle.SP_FileDialogStart))
         self.open_last_file_btn.setToolTip("Открыть последний экспортированный файл")
         self.open_last_file_btn.setEnabled(False)
         self.open_last_file_btn.clicked.connect(self.main_window.open_last_exported_file)
@@ -127,7 +135,7 @@ class TabsPanel:
         
         # Меню документов
         self.documents_menu_btn = QPushButton("Документы ▼")
-        self.documents_menu_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogNewFolder))
+        self.documents_menu_btn.setIcon(_icon(style, QStyle.SP_FileDialogNewFolder))
         self.documents_menu_btn.setToolTip("Формирование документов")
         self.documents_menu_btn.setEnabled(False)
         self.documents_menu_btn.setMenu(QMenu(self.main_window))
@@ -135,19 +143,19 @@ class TabsPanel:
         
         from PyQt5.QtWidgets import QAction
         generate_conclusion_action = QAction("Сформировать заключение...", self.main_window)
-        generate_conclusion_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogNewFolder))
+        generate_conclusion_action.setIcon(_icon(style, QStyle.SP_FileDialogNewFolder))
         generate_conclusion_action.triggered.connect(self.main_window.show_document_dialog)
         documents_menu.addAction(generate_conclusion_action)
         
         generate_letters_action = QAction("Сформировать письма...", self.main_window)
-        generate_letters_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_FileDialogNewFolder))
+        generate_letters_action.setIcon(_icon(style, QStyle.SP_FileDialogNewFolder))
         generate_letters_action.triggered.connect(self.main_window.show_document_dialog)
         documents_menu.addAction(generate_letters_action)
         
         documents_menu.addSeparator()
         
         parse_solution_action = QAction("Обработать решение о бюджете...", self.main_window)
-        parse_solution_action.setIcon(self.main_window.style().standardIcon(QStyle.SP_DialogOpenButton))
+        parse_solution_action.setIcon(_icon(style, QStyle.SP_DialogOpenButton))
         parse_solution_action.triggered.connect(self.main_window.parse_solution_document)
         documents_menu.addAction(parse_solution_action)
         
@@ -162,18 +170,21 @@ class TabsPanel:
         # Настраиваем заголовки дерева
         self.data_tree.setIndentation(10)
         # Отключаем единую высоту строк, чтобы высота подстраивалась под содержимое
+        # (наименования переносятся); измерения строк кэширует делегат
         self.data_tree.setUniformRowHeights(False)
         # Включаем множественный выбор (Shift и Ctrl)
         self.data_tree.setSelectionMode(QTreeWidget.ExtendedSelection)
         # Устанавливаем делегат для переноса текста в ячейках
-        self.data_tree.setItemDelegate(WordWrapItemDelegate())
+        self.data_tree.setItemDelegate(self.main_window.tree_config.word_wrap_delegate)
+        # Подсказки ячеек формируются только при наведении
+        self.data_tree_tooltip_filter = TreeToolTipFilter(self.data_tree, self.main_window)
         # Конфигурация заголовков будет выполнена позже (в main_window.configure_tree_headers)
         self.data_tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.data_tree.customContextMenuRequested.connect(self.main_window.show_tree_context_menu)
         self.data_tree.itemExpanded.connect(self.main_window.on_tree_item_expanded)
         self.data_tree.itemCollapsed.connect(self.main_window.on_tree_item_collapsed)
         # Обработчики выделения
-        self.data_tree.itemSelectionChanged.connect(self.main_window.on_tree_selection_changed)
+        self.data_tree.itemSelectionChanged.connect(self.main_window.schedule_tree_selection_sum)
         self.data_tree.itemClicked.connect(self.main_window.on_tree_item_clicked)
 
         # Контекстное меню по заголовкам дерева (управление столбцами)
@@ -231,7 +242,9 @@ class TabsPanel:
         # Фильтр по разделу
         header_layout.addWidget(QLabel("Раздел:"))
         self.errors_section_filter = QComboBox()
-        self.errors_section_filter.addItems(["Все", "Доходы", "Расходы", "Источники финансирования", "Консолидируемые расчеты"])
+        self.errors_section_filter.setModel(
+            QStringListModel(["Все", *_SECTIONS], self.errors_section_filter)
+        )
         self.errors_section_filter.currentTextChanged.connect(
             lambda: self.main_window.errors_manager._update_errors_table()
         )
@@ -239,42 +252,23 @@ class TabsPanel:
         
         errors_layout.addLayout(header_layout)
         
-        # Таблица ошибок
-        self.errors_table = QTableWidget()
-        self.errors_table.setColumnCount(9)
-        self.errors_table.setHorizontalHeaderLabels([
-            "Раздел",
-            "Наименование",
-            "Код строки",
-            "Уровень",
-            "Тип",
-            "Колонка",
-            "Оригинальное",
-            "Расчетное",
-            "Разница"
-        ])
+        # Таблица ошибок (представление над моделью, заголовки задает модель)
+        self.errors_table = QTableView()
+        self.errors_table.setModel(ErrorsTableModel(self.errors_table))
         
         # Настройка таблицы
         header = self.errors_table.horizontalHeader()
         # Отключаем растягивание последнего столбца
         header.setStretchLastSection(False)
-        # Используем Interactive режим для каждого столбца отдельно, чтобы можно было вручную изменять ширину
-        for i in range(9):
-            header.setSectionResizeMode(i, QHeaderView.Interactive)
+        # Interactive режим для всех столбцов одним вызовом, чтобы можно было вручную изменять ширину
+        header.setSectionResizeMode(QHeaderView.Interactive)
         # Устанавливаем начальные размеры столбцов
-        header.resizeSection(0, 120)  # Раздел
-        header.resizeSection(1, 300)  # Наименование
-        header.resizeSection(2, 100)  # Код строки
-        header.resizeSection(3, 60)   # Уровень
-        header.resizeSection(4, 120)  # Тип
-        header.resizeSection(5, 100)  # Колонка
-        header.resizeSection(6, 120)  # Оригинальное
-        header.resizeSection(7, 120)  # Расчетное
-        header.resizeSection(8, 120)  # Разница
+        for i, width in enumerate(ErrorsTableModel.COLUMN_WIDTHS):
+            header.resizeSection(i, width)
         
         self.errors_table.setAlternatingRowColors(True)
-        self.errors_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.errors_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.errors_table.setSelectionBehavior(QTableView.SelectRows)
+        self.errors_table.setEditTriggers(QTableView.NoEditTriggers)
         
         errors_layout.addWidget(self.errors_table)
         
@@ -283,7 +277,7 @@ class TabsPanel:
         buttons_layout.addStretch()
         
         self.errors_export_btn = QPushButton("Экспорт...")
-        self.errors_export_btn.setIcon(self.main_window.style().standardIcon(QStyle.SP_DialogSaveButton))
+        self.errors_export_btn.setIcon(_icon(style, QStyle.SP_DialogSaveButton))
         self.errors_export_btn.clicked.connect(self.main_window.errors_manager._export_errors)
         buttons_layout.addWidget(self.errors_export_btn)
         
@@ -303,9 +297,35 @@ class TabsPanel:
         
         tabs.addTab(self.errors_tab, "Ошибки")
         
-        # Вкладка с просмотром Excel
-        self.excel_viewer = ExcelViewer()
-        self.main_window.excel_viewer = self.excel_viewer
-        tabs.addTab(self.excel_viewer, "Просмотр формы")
+        # Вкладка с просмотром Excel: сам ExcelViewer создается при первом показе
+        # вкладки или при первой загрузке файла (см. ensure_excel_viewer)
+        self.excel_tab = QWidget()
+        self._excel_tab_layout = QVBoxLayout(self.excel_tab)
+        self._excel_tab_layout.setContentsMargins(0, 0, 0, 0)
+        self.excel_viewer = None
+        tabs.addTab(self.excel_tab, "Просмотр формы")
+        tabs.currentChanged.connect(self._on_current_tab_changed)
+        
+        # Виджеты вкладок по названию (индексы меняются при откреплении, виджеты - нет)
+        self.main_window.tab_widgets = {tabs.tabText(i): tabs.widget(i) for i in range(tabs.count())}
         
         return tabs
+
+    def ensure_excel_viewer(self):
+        """
+        Получение просмотрщика Excel с созданием при первом обращении
+
+        Returns:
+            Экземпляр ExcelViewer, размещенный на вкладке "Просмотр формы"
+        """
+        if self.excel_viewer is None:
+            from views.excel_viewer import ExcelViewer
+            self.excel_viewer = ExcelViewer()
+            self._excel_tab_layout.addWidget(self.excel_viewer)
+            self.main_window.excel_viewer = self.excel_viewer
+        return self.excel_viewer
+
+    def _on_current_tab_changed(self, index: int):
+        """Создание просмотрщика Excel при первом переходе на его вкладку"""
+        if self.excel_viewer is None and self.tabs_panel.widget(index) is self.excel_tab:
+            self.ensure_excel_viewer()
@@ -9,11 +9,46 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import QDate
 from datetime import datetime, date
+import time
 
 from models.base_models import FormType, Project
 from models.database import DatabaseManager
 
 
+# Справочники годов и МО кэшируются между открытиями диалога:
+# путь к БД -> (поколение справочников, время загрузки, отсортированный список).
+# Запись считается устаревшей по истечении TTL или после изменения справочников
+# через DatabaseManager (invalidate_reference_caches)
+_REFERENCE_CACHE_TTL = 60.0
+_YEARS_CACHE = {}
+_MUNIC_CACHE = {}
+
+
+def _load_reference(cache, db_manager: DatabaseManager, loader, sort_key, reverse: bool = False):
+    """
+    Загрузка справочника с использованием кэша между экземплярами диалога
+
+    Args:
+        cache: Кэш справочника (_YEARS_CACHE или _MUNIC_CACHE)
+        db_manager: Менеджер БД
+        loader: Функция загрузки справочника из БД
+        sort_key: Ключ сортировки списка
+        reverse: Сортировка по убыванию
+
+    Returns:
+        Отсортированный список элементов справочника (общий, не изменять)
+    """
+    now = time.monotonic()
+    generation = db_manager.reference_generation()
+    entry = cache.get(db_manager.db_path)
+    if entry is not None and entry[0] == generation and now - entry[1] < _REFERENCE_CACHE_TTL:
+        return entry[2]
+    data = loader()
+    data.sort(key=sort_key, reverse=reverse)
+    cache[db_manager.db_path] = (generation, now, data)
+    return data
+
+
 class ProjectDialog(QDialog):
     """
     Диалог создания/редактирования проекта.
@@ -41,6 +76,15 @@ class ProjectDialog(QDialog):
 
         self._years_cache = []
         self._municip_cache = []
+        # Индексы справочников для поиска без перебора списков
+        # (при совпадающих ключах сохраняется первый элемент, как при next(...))
+        self._years_by_id = {}
+        self._years_by_year = {}
+        self._municip_by_id = {}
+        self._municip_by_name = {}
+        # Индексы пунктов комбобоксов по их данным (вместо findData)
+        self._year_combo_index = {}
+        self._municipality_combo_index = {}
 
         self.init_ui()
         self._load_years()
@@ -75,23 +119,40 @@ class ProjectDialog(QDialog):
     def _load_years(self):
         """Загрузка годов из справочника в комбобокс"""
         self.year_combo.clear()
-        self._years_cache = self.db_manager.load_years()
-        # Сортируем по убыванию года
-        self._years_cache.sort(key=lambda y: y.year, reverse=True)
-        for y in self._years_cache:
+        # Отсортированный по убыванию года список (из кэша, если он актуален)
+        self._years_cache = _load_reference(
+            _YEARS_CACHE, self.db_manager, self.db_manager.load_years,
+            sort_key=lambda y: y.year, reverse=True
+        )
+        self._years_by_id = {}
+        self._years_by_year = {}
+        self._year_combo_index = {}
+        for idx, y in enumerate(self._years_cache):
+            self._years_by_id.setdefault(y.id, y)
+            self._years_by_year.setdefault(y.year, y)
+            self._year_combo_index.setdefault(y.year, idx)
             self.year_combo.addItem(str(y.year), y.year)
         if self.year_combo.count() == 0:
             # Если справочник пуст — добавляем текущий год как fallback (только в UI)
             current_year = datetime.now().year
             self.year_combo.addItem(str(current_year), current_year)
+            self._year_combo_index[current_year] = 0
 
     def _load_municipalities(self):
         """Загрузка МО из справочника в комбобокс"""
         self.municipality_combo.clear()
-        self._municip_cache = self.db_manager.load_municipalities()
-        # Сортируем по имени
-        self._municip_cache.sort(key=lambda m: m.name.lower() if m.name else "")
-        for m in self._municip_cache:
+        # Отсортированный по имени список (из кэша, если он актуален)
+        self._municip_cache = _load_reference(
+            _MUNIC_CACHE, self.db_manager, self.db_manager.load_municipalities,
+            sort_key=lambda m: m.name.lower() if m.name else ""
+        )
+        self._municip_by_id = {}
+        self._municip_by_name = {}
+        self._municipality_combo_index = {}
+        for idx, m in enumerate(self._municip_cache):
+            self._municip_by_id.setdefault(m.id, m)
+            self._municip_by_name.setdefault(m.name, m)
+            self._municipality_combo_index.setdefault(m.name, idx)
             display = f"{m.code} — {m.name}" if m.code else m.name
             self.municipality_combo.addItem(display, m.name)
         if self.municipality_combo.count() == 0:
@@ -112,28 +173,22 @@ class ProjectDialog(QDialog):
 
         # Год: по year_id (новая архитектура)
         year_val = None
-        if project.year_id and self._years_cache:
-            try:
-                year_ref = next((y for y in self._years_cache if y.id == project.year_id), None)
-                if year_ref:
-                    year_val = year_ref.year
-            except Exception:
-                year_val = None
+        if project.year_id:
+            year_ref = self._years_by_id.get(project.year_id)
+            if year_ref:
+                year_val = year_ref.year
         if year_val:
-            idx = self.year_combo.findData(year_val)
-            if idx >= 0:
+            idx = self._year_combo_index.get(year_val)
+            if idx is not None:
                 self.year_combo.setCurrentIndex(idx)
 
         # МО: ищем по municipality_id
-        if project.municipality_id and self.municipality_combo.count() > 0 and self._municip_cache:
-            try:
-                municip_ref = next((m for m in self._municip_cache if m.id == project.municipality_id), None)
-                if municip_ref:
-                    idx = self.municipality_combo.findData(municip_ref.name)
-                    if idx >= 0:
-                        self.municipality_combo.setCurrentIndex(idx)
-            except Exception:
-                pass
+        if project.municipality_id:
+            municip_ref = self._municip_by_id.get(project.municipality_id)
+            if municip_ref:
+                idx = self._municipality_combo_index.get(municip_ref.name)
+                if idx is not None:
+                    self.municipality_combo.setCurrentIndex(idx)
 
     def get_project_data(self):
         """Получение данных проекта"""
@@ -147,7 +202,7 @@ class ProjectDialog(QDialog):
             try:
                 year_val_int = int(year_val)
                 # Находим year_id из кэша
-                year_ref = next((y for y in self._years_cache if y.year == year_val_int), None)
+                year_ref = self._years_by_year.get(year_val_int)
                 if year_ref:
                     year_id = year_ref.id
                 else:
@@ -164,7 +219,7 @@ class ProjectDialog(QDialog):
             municipality_name = self.municipality_combo.currentData() or ""
             if municipality_name:
                 # Находим municipality_id из кэша
-                municip_ref = next((m for m in self._municip_cache if m.name == municipality_name), None)
+                municip_ref = self._municip_by_name.get(municipality_name)
                 if municip_ref:
                     municipality_id = municip_ref.id
                 else:
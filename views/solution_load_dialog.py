@@ -6,11 +6,47 @@ from PyQt5.QtWidgets import (
     QPushButton, QLabel, QFileDialog, QComboBox,
     QDialogButtonBox, QMessageBox, QTextEdit, QGroupBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from pathlib import Path
 from logger import logger
 
 
+class _SolutionParseSignals(QObject):
+    """Сигналы фоновой обработки решения (доставляются в поток интерфейса)"""
+    
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class _SolutionParseWorker(QRunnable):
+    """Фоновый разбор Word-документа решения, чтобы не блокировать интерфейс"""
+    
+    def __init__(self, solution_controller, file_path: str, project_id: int):
+        """
+        Args:
+            solution_controller: Контроллер решений
+            file_path: Путь к Word документу
+            project_id: ID проекта
+        """
+        super().__init__()
+        self.solution_controller = solution_controller
+        self.file_path = file_path
+        self.project_id = project_id
+        self.signals = _SolutionParseSignals()
+    
+    def run(self):
+        try:
+            result = self.solution_controller.parse_solution_document(
+                file_path=self.file_path,
+                project_id=self.project_id
+            )
+        except Exception as e:
+            logger.error(f"Ошибка обработки решения: {e}", exc_info=True)
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
 class SolutionLoadDialog(QDialog):
     """Диалог для загрузки и обработки решений о бюджете"""
     
@@ -23,6 +59,8 @@ class SolutionLoadDialog(QDialog):
         self.solution_file_path = None
         self.project_id = None
         self.solution_id = None
+        # Текущая фоновая обработка (ссылка удерживает сигналы до завершения)
+        self._parse_worker = None
         
         self.init_ui()
         self.load_projects()
@@ -126,40 +164,45 @@ class SolutionLoadDialog(QDialog):
     
     def process_solution(self):
         """Обработка решения"""
+        self.project_id = self.project_combo.currentData()
+        if not self.project_id:
+            QMessageBox.warning(self, "Ошибка", "Выберите проект")
+            return
+        
+        if not self.solution_file_path:
+            QMessageBox.warning(self, "Ошибка", "Выберите файл решения")
+            return
+        
+        # Вызываем метод контроллера через родительское окно
+        parent = self.parent()
+        if not hasattr(parent, 'controller'):
+            QMessageBox.warning(self, "Ошибка", "Контроллер не найден")
+            return
+        
+        # Проверяем наличие solution_controller
+        if not hasattr(parent.controller, 'solution_controller'):
+            QMessageBox.warning(self, "Ошибка", "Контроллер решений не найден")
+            return
+        
+        # Парсим документ в фоновом потоке, результат обрабатывается в слотах
+        self.results_text.clear()
+        self.results_text.append("Обработка решения...")
+        self.process_btn.setEnabled(False)
+        
+        worker = _SolutionParseWorker(
+            parent.controller.solution_controller, self.solution_file_path, self.project_id
+        )
+        worker.signals.finished.connect(self._on_solution_parsed)
+        worker.signals.failed.connect(self._on_solution_parse_failed)
+        self._parse_worker = worker
+        QThreadPool.globalInstance().start(worker)
+    
+    def _on_solution_parsed(self, result):
+        """Сохранение и отображение результатов разбора решения"""
+        self._parse_worker = None
         try:
-            self.project_id = self.project_combo.currentData()
-            if not self.project_id:
-                QMessageBox.warning(self, "Ошибка", "Выберите проект")
-                return
-            
-            if not self.solution_file_path:
-                QMessageBox.warning(self, "Ошибка", "Выберите файл решения")
-                return
-            
-            # Вызываем метод контроллера через родительское окно
-            parent = self.parent()
-            if not hasattr(parent, 'controller'):
-                QMessageBox.warning(self, "Ошибка", "Контроллер не найден")
-                return
-            
-            # Проверяем наличие solution_controller
-            if not hasattr(parent.controller, 'solution_controller'):
-                QMessageBox.warning(self, "Ошибка", "Контроллер решений не найден")
-                return
-            
-            solution_controller = parent.controller.solution_controller
-            
-            # Парсим документ
-            self.results_text.clear()
-            self.results_text.append("Обработка решения...")
-            self.process_btn.setEnabled(False)
-            
-            result = solution_controller.parse_solution_document(
-                file_path=self.solution_file_path,
-                project_id=self.project_id
-            )
-            
             if result:
+                solution_controller = self.parent().controller.solution_controller
                 # Сохраняем данные в БД
                 self.solution_id = solution_controller.save_solution_data(
                     project_id=self.project_id,
@@ -198,12 +241,19 @@ class SolutionLoadDialog(QDialog):
             
         except Exception as e:
             logger.error(f"Ошибка обработки решения: {e}", exc_info=True)
-            self.results_text.clear()
-            self.results_text.append(f"Ошибка: {str(e)}")
-            QMessageBox.critical(self, "Ошибка", f"Ошибка обработки решения:\n{str(e)}")
+            self._on_solution_parse_failed(str(e))
+            return
         finally:
             self.process_btn.setEnabled(True)
     
+    def _on_solution_parse_failed(self, error: str):
+        """Отображение ошибки обработки решения"""
+        self._parse_worker = None
+        self.results_text.clear()
+        self.results_text.append(f"Ошибка: {error}")
+        QMessageBox.critical(self, "Ошибка", f"Ошибка обработки решения:\n{error}")
+        self.process_btn.setEnabled(True)
+    
     def get_solution_id(self):
         """Получить ID сохраненного решения"""
         return self.solution_id
@@ -2,10 +2,54 @@
 from PyQt5.QtWidgets import QTreeWidget, QTreeWidgetItem, QHeaderView
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor, QBrush
+import numpy as np
+import pandas as pd
 from logger import logger
 from models.constants.form_0503317_constants import Form0503317Constants
 
 
+# Маркер отсутствующего ключа (отличается от None и 0)
+_MISSING = object()
+
+
+# Раздел -> ключ данных раздела в project.data
+_SECTION_DATA_KEYS = {
+    "Доходы": "доходы_data",
+    "Расходы": "расходы_data",
+    "Источники финансирования": "источники_финансирования_data",
+    "Консолидируемые расчеты": "консолидируемые_расчеты_data"
+}
+
+
+# Роль данных элемента дерева с номером строки в данных раздела
+ROW_INDEX_ROLE = Qt.UserRole + 1
+
+
+def _to_float_matrix(rows, column_total: int, zero_values=(None, "", "x")) -> np.ndarray:
+    """Преобразование значений в матрицу float по правилам _is_value_different
+    
+    Значения из zero_values (по умолчанию None, "" и "x") считаются нулем,
+    непреобразуемые значения становятся NaN (сравнение с NaN дает
+    "нет несоответствия", как и ValueError в исходной проверке).
+    """
+    series = pd.Series([value for row in rows for value in row], dtype=object)
+    if zero_values:
+        series = series.where(~series.isin(list(zero_values)), 0.0)
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+    return values.reshape(len(rows), column_total)
+
+
+def _format_value_pair(original, calculated) -> str:
+    """Текст ячейки с несоответствием: значение и расчетное значение в скобках"""
+    # Быстрая проверка точного типа, isinstance — только для подклассов (например, numpy)
+    original_type = type(original)
+    calculated_type = type(calculated)
+    if ((original_type is float or original_type is int or isinstance(original, (int, float)))
+            and (calculated_type is float or calculated_type is int or isinstance(calculated, (int, float)))):
+        return f"{original:,.2f} ({calculated:,.2f})"
+    return f"{original} ({calculated})"
+
+
 class TreeBuilder:
     """Класс для построения дерева из данных"""
     
@@ -15,9 +59,246 @@ class TreeBuilder:
             main_window: Ссылка на главное окно для доступа к методам и свойствам
         """
         self.main_window = main_window
+        # Кисть для выделения несоответствий (красный)
+        self._error_brush = QBrush(QColor("#FF6B6B"))
+        # Кисти фона по цвету уровня: {color: QBrush}
+        self._level_brushes = {}
+        # Исходные значения раздела: строка данных x колонка значений (для суммы выделения)
+        self._column_values = None
+        # Элементы строк загруженного раздела для инкрементального обновления:
+        # дерево -> {ключ строки: QTreeWidgetItem} (None, если ключи строк не уникальны)
+        self._row_items = {}
+        self._row_items_mapping = None
+        # Прототипы элементов с фоном уровня: (уровень, число колонок) -> QTreeWidgetItem
+        self._proto_by_level = {}
+        # Кэши сравнения и форматирования значений (очищаются при каждой загрузке дерева)
+        self._diff_cache = {}
+        self._format_cache = {}
+        # Текст для нулевого значения (самый частый случай)
+        self._zero_text = self._compute_budget_value_text(0)
+        # Раскладка колонок значений для текущего mapping колонок
+        self._column_layout = {}
+        self._column_layout_mapping = None
+    
+    def _get_level_brush(self, color: str) -> QBrush:
+        """Получить (и закэшировать) кисть фона для цвета уровня"""
+        brush = self._level_brushes.get(color)
+        if brush is None:
+            brush = QBrush(QColor(color))
+            self._level_brushes[color] = brush
+        return brush
+    
+    @staticmethod
+    def _row_key(item) -> tuple:
+        """Ключ строки данных, не меняющийся при пересчете сумм"""
+        return (
+            item.get('код_строки'),
+            item.get('код_классификации'),
+            item.get('наименование_показателя'),
+            item.get('уровень', 0),
+        )
+    
+    def _get_level_prototype(self, level, level_colors, column_count: int) -> QTreeWidgetItem:
+        """Получить (и закэшировать) прототип элемента с фоном уровня во всех колонках
+        
+        Элементы строк создаются через clone() прототипа, поэтому фон не нужно
+        устанавливать для каждой колонки каждой строки.
+        """
+        key = (level, column_count)
+        proto = self._proto_by_level.get(key)
+        if proto is None:
+            proto = QTreeWidgetItem([""] * column_count)
+            color = level_colors.get(level)
+            if color is not None:
+                brush = self._get_level_brush(color)
+                for i in range(column_count):
+                    proto.setBackground(i, brush)
+            self._proto_by_level[key] = proto
+        return proto
+    
+    def _get_column_layout(self, mapping) -> dict:
+        """Раскладка колонок значений текущего раздела
+        
+        Строки ключей вида 'расчетный_утвержденный_<колонка>', индексы колонок
+        дерева и признаки итоговых колонок строятся один раз для mapping колонок,
+        а не для каждой строки дерева.
+        
+        Returns:
+            Словарь с ключами полей, списком индексов колонок дерева ("tree_columns"),
+            признаками колонок, проверяемых на всех уровнях ("total_flags"), и
+            источниками данных по индексу колонки дерева ("column_sources")
+        """
+        if self._column_layout_mapping is not mapping:
+            column_type = mapping.get("type", "base")
+            budget_cols = mapping.get("budget_columns", [])
+            cons_cols = mapping.get("columns", [])
+            if column_type == "budget":
+                approved_start = mapping.get("approved_start", 4)
+                executed_start = mapping.get("executed_start", approved_start + len(budget_cols))
+                tree_columns = (
+                    [approved_start + idx for idx in range(len(budget_cols))]
+                    + [executed_start + idx for idx in range(len(budget_cols))]
+                )
+                total_flags = [False] * len(tree_columns)
+            elif column_type == "consolidated":
+                value_start = mapping.get("value_start", 4)
+                tree_columns = [value_start + idx for idx in range(len(cons_cols))]
+                # Столбец "ИТОГО" проверяется на всех уровнях, так как это итоговая сумма
+                total_flags = [col == 'ИТОГО' for col in cons_cols]
+            else:
+                tree_columns = []
+                total_flags = []
+            # Источник данных каждой колонки значений:
+            # индекс колонки дерева -> (ключ данных, колонка, плоский ключ, индекс значения)
+            if column_type == "budget":
+                sources = (
+                    [('утвержденный', col, None) for col in budget_cols]
+                    + [('исполненный', col, None) for col in budget_cols]
+                )
+            else:
+                sources = [('поступления', col, f'поступления_{col}') for col in cons_cols]
+            column_sources = [None] * (max(tree_columns) + 1 if tree_columns else 0)
+            for value_index, (col_index, source) in enumerate(zip(tree_columns, sources)):
+                if column_sources[col_index] is None:
+                    column_sources[col_index] = source + (value_index,)
+            self._column_layout = {
+                "calc_approved": [f'расчетный_утвержденный_{col}' for col in budget_cols],
+                "calc_executed": [f'расчетный_исполненный_{col}' for col in budget_cols],
+                "flat_cons": [f'поступления_{col}' for col in cons_cols],
+                "calc_cons": [f'расчетный_поступления_{col}' for col in cons_cols],
+                "tree_columns": tree_columns,
+                "total_flags": total_flags,
+                "column_sources": column_sources,
+            }
+            self._column_layout_mapping = mapping
+        return self._column_layout
+    
+    def _extract_cell_values(self, item, mapping, layout, level=0):
+        """Исходные и расчетные значения всех колонок значений строки
+        
+        Порядок значений совпадает с layout["tree_columns"]: для бюджетных разделов
+        сначала утвержденные, затем исполненные колонки. Для уровней >= 6
+        несоответствия не проверяются (кроме итоговых колонок), поэтому расчетные
+        поля не читаются и расчетным значением считается исходное.
+        
+        Returns:
+            Кортеж (originals, calculateds)
+        """
+        originals = []
+        calculateds = []
+        column_type = mapping.get("type", "base")
+        
+        if column_type == "budget":
+            budget_cols = mapping.get("budget_columns", [])
+            blocks = (
+                (item.get('утвержденный', {}) or {}, layout["calc_approved"]),
+                (item.get('исполненный', {}) or {}, layout["calc_executed"]),
+            )
+            if level < 6:
+                for values, calc_keys in blocks:
+                    for col, calc_key in zip(budget_cols, calc_keys):
+                        original = values.get(col) or 0
+                        originals.append(original)
+                        calculateds.append(item.get(calc_key, original))
+            else:
+                for values, _ in blocks:
+                    originals.extend([values.get(col) or 0 for col in budget_cols])
+                calculateds = list(originals)
+        
+        elif column_type == "consolidated":
+            cons_cols = mapping.get("columns", [])
+            # Данные поступлений (может быть вложенным словарем или плоскими полями)
+            cons_data = item.get('поступления', {}) or {}
+            cons_is_dict = isinstance(cons_data, dict)
+            check_all = level < 6
+            for col, flat_key, calc_key, is_total in zip(
+                cons_cols, layout["flat_cons"], layout["calc_cons"], layout["total_flags"]
+            ):
+                # Оригинальное значение - проверяем и вложенный словарь, и плоские поля
+                value = cons_data.get(col, _MISSING) if cons_is_dict else _MISSING
+                if value is _MISSING:
+                    # Если нет вложенного словаря, проверяем плоские поля
+                    value = item.get(flat_key)
+                original = value or 0
+                if not (check_all or is_total):
+                    # Колонка не проверяется на этом уровне
+                    originals.append(original)
+                    calculateds.append(original)
+                    continue
+                # Расчетное значение - плоские поля (после to_dict('records')),
+                # при отсутствии используем оригинальное значение
+                calculated = item.get(calc_key)
+                if calculated is None:
+                    calculated = original
+                originals.append(original)
+                calculateds.append(calculated)
+        
+        return originals, calculateds
     
-    def build_tree_from_data(self, data, tree_widget=None):
-        """Построение дерева из данных"""
+    def _compute_section_cells(self, data, mapping):
+        """Значения и признаки несоответствий для всех строк раздела
+        
+        Сравнение исходных и расчетных значений выполняется одной векторной
+        операцией NumPy для всего раздела вместо вызова _is_value_different
+        для каждой ячейки.
+        
+        Также сохраняет матрицу исходных значений раздела (_column_values)
+        для подсчета суммы выделенных строк.
+        
+        Returns:
+            Список (выровненный с data) кортежей (originals, calculateds, mismatches)
+            или None для строк, не являющихся словарем; None целиком, если
+            векторный расчет невозможен (тогда ячейки проверяются построчно)
+        """
+        self._column_values = None
+        layout = self._get_column_layout(mapping)
+        column_total = len(layout["tree_columns"])
+        if column_total == 0:
+            return None
+        
+        try:
+            positions = []
+            extracted = []
+            level_checks = []
+            for position, item in enumerate(data):
+                if not isinstance(item, dict):
+                    continue
+                positions.append(position)
+                level = item.get('уровень', 0)
+                extracted.append(self._extract_cell_values(item, mapping, layout, level))
+                # Несоответствия проверяются только для уровней < 6
+                level_checks.append(level < 6)
+            if not extracted:
+                return None
+            
+            originals = _to_float_matrix([row[0] for row in extracted], column_total)
+            calculateds = _to_float_matrix([row[1] for row in extracted], column_total)
+            should_check = np.array(level_checks)[:, None] | np.array(layout["total_flags"])[None, :]
+            mismatches = (np.abs(originals - calculateds) > 0.00001) & should_check
+            # Значения для суммы выделения: "x" и нечисловые значения не суммируются (NaN)
+            column_values = np.full((len(data), column_total), np.nan)
+            column_values[positions] = _to_float_matrix(
+                [row[0] for row in extracted], column_total, zero_values=()
+            )
+            self._column_values = column_values
+        except Exception as e:
+            logger.debug(f"Векторная проверка несоответствий недоступна: {e}")
+            return None
+        
+        cells = [None] * len(data)
+        for row_index, position in enumerate(positions):
+            cells[position] = (extracted[row_index][0], extracted[row_index][1], mismatches[row_index].tolist())
+        return cells
+    
+    def build_tree_from_data(self, data, tree_widget=None, section_cells=None):
+        """Построение дерева из данных
+        
+        Args:
+            data: Строки раздела
+            tree_widget: Виджет дерева (по умолчанию дерево главного окна)
+            section_cells: Результат _compute_section_cells для data; передается,
+                когда одни и те же данные выводятся в несколько деревьев
+        """
         try:
             if tree_widget is None:
                 tree_widget = self.main_window.data_tree
@@ -28,6 +309,9 @@ class TreeBuilder:
             if not isinstance(data, list) or len(data) == 0:
                 return
             
+            # Прототипы строятся заново: цвета и число колонок могут отличаться
+            self._proto_by_level.clear()
+            
             # Цвета для уровней
             level_colors = {
                 0: "#E6E6FA", 1: "#68e368", 2: "#98FB98", 3: "#FFFF99", 
@@ -40,41 +324,70 @@ class TreeBuilder:
             parents_stack = []  # список кортежей (level, QTreeWidgetItem)
             items_created = 0
             items_failed = 0
+            # Индекс элементов по ключу строки (для инкрементального обновления)
+            row_items = {}
 
-            for item in data:
-                try:
-                    if not isinstance(item, dict):
-                        items_failed += 1
-                        continue
+            # Отключаем перерисовку, сигналы и сортировку на время массового заполнения
+            updates_were_enabled = tree_widget.updatesEnabled()
+            signals_were_blocked = tree_widget.blockSignals(True)
+            sorting_was_enabled = tree_widget.isSortingEnabled()
+            tree_widget.setUpdatesEnabled(False)
+            tree_widget.setSortingEnabled(False)
+            # Несоответствия всего раздела вычисляем заранее одной векторной операцией
+            if section_cells is None:
+                mapping = getattr(self.main_window, 'tree_column_mapping', {})
+                section_cells = self._compute_section_cells(data, mapping)
+            try:
+                for position, item in enumerate(data):
+                    try:
+                        if not isinstance(item, dict):
+                            items_failed += 1
+                            continue
                     
-                    level = item.get('уровень', 0)
-                    tree_item = self.create_tree_item(item, level_colors, tree_widget)
+                        level = item.get('уровень', 0)
+                        tree_item = self.create_tree_item(
+                            item, level_colors, tree_widget,
+                            cells=section_cells[position] if section_cells else None
+                        )
+                        tree_item.setData(0, ROW_INDEX_ROLE, position)
                 
-                    # Убираем из стека все уровни, которые не могут быть родителями
-                    while parents_stack and parents_stack[-1][0] >= level:
-                        parents_stack.pop()
+                        # Убираем из стека все уровни, которые не могут быть родителями
+                        while parents_stack and parents_stack[-1][0] >= level:
+                            parents_stack.pop()
 
-                    if parents_stack:
-                        # Текущий элемент становится ребёнком последнего подходящего родителя
-                        parents_stack[-1][1].addChild(tree_item)
-                    else:
-                        # Если родителя нет, это корневой элемент
-                        tree_widget.addTopLevelItem(tree_item)
+                        if parents_stack:
+                            # Текущий элемент становится ребёнком последнего подходящего родителя
+                            parents_stack[-1][1].addChild(tree_item)
+                        else:
+                            # Если родителя нет, это корневой элемент
+                            tree_widget.addTopLevelItem(tree_item)
 
-                    # Запоминаем текущий элемент как последний для своего уровня
-                    parents_stack.append((level, tree_item))
-                    items_created += 1
-                except Exception as e:
-                    items_failed += 1
-                    logger.warning(f"Ошибка создания элемента дерева: {e}", exc_info=True)
-                    continue
+                        # Запоминаем текущий элемент как последний для своего уровня
+                        parents_stack.append((level, tree_item))
+                        items_created += 1
+                        if row_items is not None:
+                            row_key = self._row_key(item)
+                            if row_key in row_items:
+                                # Ключи строк не уникальны - обновлять можно только полной перестройкой
+                                row_items = None
+                            else:
+                                row_items[row_key] = tree_item
+                    except Exception as e:
+                        items_failed += 1
+                        logger.warning(f"Ошибка создания элемента дерева: {e}", exc_info=True)
+                        continue
             
-            # Разворачиваем уровень 0
-            for i in range(tree_widget.topLevelItemCount()):
-                try:
+                self._row_items[tree_widget] = row_items if not items_failed else None
+                self._row_items_mapping = getattr(self.main_window, 'tree_column_mapping', {})
+                
+                # Разворачиваем уровень 0
+                for i in range(tree_widget.topLevelItemCount()):
                     tree_widget.topLevelItem(i).setExpanded(True)
-                except:
-                    pass
+            finally:
+                tree_widget.setSortingEnabled(sorting_was_enabled)
+                tree_widget.blockSignals(signals_were_blocked)
+                tree_widget.setUpdatesEnabled(updates_were_enabled)
+                tree_widget.viewport().update()
             
             # Обновляем размеры столбцов после загрузки данных
             if items_created > 0:
@@ -118,8 +431,16 @@ class TreeBuilder:
             if tree_widget == self.main_window.data_tree:
                 self.main_window.status_bar.showMessage(error_msg)
     
-    def create_tree_item(self, item, level_colors, tree_widget=None):
-        """Создание элемента дерева"""
+    def create_tree_item(self, item, level_colors, tree_widget=None, cells=None):
+        """Создание элемента дерева
+        
+        Args:
+            item: Строка данных
+            level_colors: Цвета фона по уровням
+            tree_widget: Виджет дерева (по умолчанию дерево главного окна)
+            cells: Предвычисленные (originals, calculateds, mismatches) строки,
+                см. _compute_section_cells; если не переданы, вычисляются здесь
+        """
         try:
             if tree_widget is None:
                 tree_widget = self.main_window.data_tree
@@ -132,159 +453,26 @@ class TreeBuilder:
                 tree_widget.setColumnCount(1)
                 column_count = 1
             
-            tree_item = QTreeWidgetItem([""] * column_count)
+            row, error_columns = self._build_row(item, level, column_count, cells)
             
-            # Основные данные
-            name = str(item.get('наименование_показателя', ''))
-            code_line = str(item.get('код_строки', ''))
-            class_code = str(item.get('код_классификации_форматированный', item.get('код_классификации', '')))
-
-            if column_count > 0:
-                tree_item.setText(0, name)
-            if column_count > 1:
-                tree_item.setText(1, code_line)
-            if column_count > 2:
-                tree_item.setText(2, class_code)
-            if column_count > 3:
-                tree_item.setText(3, str(level))
-
-            # Получаем mapping из main_window
-            mapping = getattr(self.main_window, 'tree_column_mapping', {})
-            column_type = mapping.get("type", "base")
-
-            if column_type == "budget":
-                budget_cols = mapping.get("budget_columns", [])
-                approved_start = mapping.get("approved_start", 4)
-                executed_start = mapping.get("executed_start", approved_start + len(budget_cols))
-                approved_data = item.get('утвержденный', {}) or {}
-                executed_data = item.get('исполненный', {}) or {}
-                
-                # Цвет для выделения несоответствий (красный)
-                error_color = QColor("#FF6B6B")
-
-                for idx, col in enumerate(budget_cols):
-                    try:
-                        # Утвержденные значения
-                        original_approved = approved_data.get(col, 0) or 0
-                        calculated_approved = item.get(f'расчетный_утвержденный_{col}', original_approved)
-                        
-                        # Проверяем несоответствие (только для уровней < 6)
-                        if level < 6 and self._is_value_different(original_approved, calculated_approved):
-                            # Показываем значение с расчетным в скобках
-                            if isinstance(original_approved, (int, float)) and isinstance(calculated_approved, (int, float)):
-                                approved_value = f"{original_approved:,.2f} ({calculated_approved:,.2f})"
-                            else:
-                                approved_value = f"{original_approved} ({calculated_approved})"
-                            # Выделяем красным цветом
-                            if approved_start + idx < column_count:
-                                tree_item.setText(approved_start + idx, approved_value)
-                                tree_item.setForeground(approved_start + idx, QBrush(error_color))
-                        else:
-                            approved_value = self.format_budget_value(original_approved)
-                            if approved_start + idx < column_count:
-                                tree_item.setText(approved_start + idx, approved_value)
-                        
-                        # Исполненные значения
-                        original_executed = executed_data.get(col, 0) or 0
-                        calculated_executed = item.get(f'расчетный_исполненный_{col}', original_executed)
-                        
-                        # Проверяем несоответствие (только для уровней < 6)
-                        if level < 6 and self._is_value_different(original_executed, calculated_executed):
-                            # Показываем значение с расчетным в скобках
-                            if isinstance(original_executed, (int, float)) and isinstance(calculated_executed, (int, float)):
-                                executed_value = f"{original_executed:,.2f} ({calculated_executed:,.2f})"
-                            else:
-                                executed_value = f"{original_executed} ({calculated_executed})"
-                            # Выделяем красным цветом
-                            if executed_start + idx < column_count:
-                                tree_item.setText(executed_start + idx, executed_value)
-                                tree_item.setForeground(executed_start + idx, QBrush(error_color))
-                        else:
-                            executed_value = self.format_budget_value(original_executed)
-                            if executed_start + idx < column_count:
-                                tree_item.setText(executed_start + idx, executed_value)
-                    except Exception as e:
-                        logger.warning(f"Ошибка обработки несоответствий для колонки {col}: {e}", exc_info=True)
-                        pass
-
-            elif column_type == "consolidated":
-                value_start = mapping.get("value_start", 4)
-                cons_cols = mapping.get("columns", [])
-                
-                # Получаем данные поступлений (может быть вложенным словарем или плоскими полями)
-                cons_data = item.get('поступления', {}) or {}
-                
-                # Цвет для выделения несоответствий (красный)
-                error_color = QColor("#FF6B6B")
-                
-                for idx, col in enumerate(cons_cols):
-                    try:
-                        # Оригинальное значение - проверяем и вложенный словарь, и плоские поля
-                        if isinstance(cons_data, dict) and col in cons_data:
-                            original_value = cons_data.get(col, 0) or 0
-                        else:
-                            # Если нет вложенного словаря, проверяем плоские поля
-                            original_value = item.get(f'поступления_{col}', 0) or 0
-                        
-                        # Расчетное значение - проверяем плоские поля (после to_dict('records'))
-                        calculated_value = item.get(f'расчетный_поступления_{col}')
-                        if calculated_value is None:
-                            # Fallback на оригинальное значение, если расчетного нет
-                            calculated_value = original_value
-                        
-                        # Проверяем несоответствие (аналогично бюджетным разделам — до 5 уровня),
-                        # а для столбца "ИТОГО" проверяем на всех уровнях, так как это итоговая сумма
-                        is_total_column = (col == 'ИТОГО')
-                        should_check = (level < 6) or is_total_column
-                        
-                        if should_check and self._is_value_different(original_value, calculated_value):
-                            # Показываем значение с расчетным в скобках
-                            if isinstance(original_value, (int, float)) and isinstance(calculated_value, (int, float)):
-                                display_value = f"{original_value:,.2f} ({calculated_value:,.2f})"
-                            else:
-                                display_value = f"{original_value} ({calculated_value})"
-                            # Выделяем красным цветом
-                            if value_start + idx < column_count:
-                                tree_item.setText(value_start + idx, display_value)
-                                tree_item.setForeground(value_start + idx, QBrush(error_color))
-                        else:
-                            # Обычное отображение без несоответствий
-                            if value_start + idx < column_count:
-                                tree_item.setText(value_start + idx, self.format_budget_value(original_value))
-                    except Exception as e:
-                        logger.warning(f"Ошибка обработки несоответствий для консолидируемых расчетов, колонка {col}: {e}", exc_info=True)
-                        pass
+            # Элемент копируется из прототипа уровня (фон уже установлен),
+            # заполняются только непустые ячейки
+            tree_item = self._get_level_prototype(level, level_colors, column_count).clone()
+            for col_index, text in enumerate(row):
+                if text:
+                    tree_item.setText(col_index, text)
             
-            # Устанавливаем цвет фона для всех столбцов
-            try:
-                if level in level_colors:
-                    color = QColor(level_colors[level])
-                    brush = QBrush(color)
-                    # Применяем цвет ко всем столбцам
-                    for i in range(column_count):
-                        tree_item.setBackground(i, brush)
-            except Exception as e:
-                logger.warning(f"Ошибка установки цвета фона для уровня {level}: {e}", exc_info=True)
-                pass
+            # Окрашиваем только ячейки, которым это действительно нужно:
+            # несоответствия выделяем красным цветом
+            paint_cells = [(col_index, self._error_brush) for col_index in error_columns]
+            for col_index, brush in paint_cells:
+                tree_item.setForeground(col_index, brush)
             
-            # Устанавливаем подсказки (колонка -> заголовок)
-            try:
-                tree_header_tooltips = getattr(self.main_window, 'tree_header_tooltips', [])
-                for idx, tip in enumerate(tree_header_tooltips):
-                    if idx < tree_item.columnCount() and idx < len(tree_header_tooltips):
-                        current_text = tree_item.text(idx)
-                        if current_text:
-                            tree_item.setToolTip(idx, f"{tip}: {current_text}")
-                        else:
-                            tree_item.setToolTip(idx, tip)
-            except:
-                pass
+            # Подсказки (колонка -> заголовок) формируются лениво при наведении,
+            # см. views.widgets.TreeToolTipFilter
 
             # Сохраняем исходные данные
-            try:
-                tree_item.setData(0, Qt.UserRole, item)
-            except:
-                pass
+            tree_item.setData(0, Qt.UserRole, item)
             
             return tree_item
         except Exception as e:
@@ -294,8 +482,147 @@ class TreeBuilder:
             tree_item = QTreeWidgetItem([""] * column_count)
             return tree_item
     
+    def _build_row(self, item, level, column_count: int, cells=None):
+        """Тексты ячеек строки дерева и колонки с несоответствиями
+        
+        Args:
+            item: Строка данных
+            level: Уровень строки
+            column_count: Число колонок дерева
+            cells: Предвычисленные значения строки (см. _compute_section_cells)
+        
+        Returns:
+            Кортеж (список текстов колонок, список индексов колонок с несоответствиями)
+        """
+        # Основные данные
+        name = str(item.get('наименование_показателя', ''))
+        code_line = str(item.get('код_строки', ''))
+        class_code = str(item.get('код_классификации_форматированный', item.get('код_классификации', '')))
+
+        # Формируем строку целиком
+        row = [name, code_line, class_code, str(level)][:column_count]
+        row.extend([""] * (column_count - len(row)))
+        # Индексы колонок с несоответствиями (выделяются красным)
+        error_columns = []
+
+        # Получаем mapping из main_window
+        mapping = getattr(self.main_window, 'tree_column_mapping', {})
+        layout = self._get_column_layout(mapping)
+        tree_columns = layout["tree_columns"]
+
+        if tree_columns:
+            if cells is not None:
+                originals, calculateds, mismatches = cells
+            else:
+                originals, calculateds = self._extract_cell_values(item, mapping, layout, level)
+                mismatches = None
+            total_flags = layout["total_flags"]
+            
+            # Обработка исключений вынесена за пределы цикла по ячейкам:
+            # ошибка в строке логируется один раз
+            build_cell = self._build_cell
+            try:
+                for value_index, col_index in enumerate(tree_columns):
+                    # Колонки за пределами дерева пропускаем
+                    if col_index >= column_count:
+                        continue
+                    original = originals[value_index]
+                    calculated = calculateds[value_index]
+                    if mismatches is not None:
+                        is_different = mismatches[value_index]
+                    else:
+                        # Проверяем несоответствие (до 5 уровня, итоговые колонки — на всех уровнях)
+                        should_check = level < 6 or total_flags[value_index]
+                        is_different = should_check and self._is_value_different(original, calculated)
+                    text, is_error = build_cell(original, calculated, is_different)
+                    row[col_index] = text
+                    if is_error:
+                        error_columns.append(col_index)
+            except Exception as e:
+                logger.warning(
+                    f"Ошибка обработки несоответствий в строке '{name}' ({code_line}): {e}",
+                    exc_info=True
+                )
+        
+        return row, error_columns
+    
+    def _build_cell(self, original, calculated, is_different: bool):
+        """Текст ячейки значения и признак несоответствия
+        
+        Returns:
+            Кортеж (текст, выделять ли ячейку как несоответствие)
+        """
+        if original == 0 and calculated == 0:
+            # Нулевые значения не могут расходиться
+            return self._zero_text, False
+        if is_different:
+            # Показываем значение с расчетным в скобках и выделяем красным цветом
+            return _format_value_pair(original, calculated), True
+        return self.format_budget_value(original), False
+    
+    def default_value_column(self) -> int:
+        """Индекс первого столбца значений текущего раздела (4, если значений нет)"""
+        tree_columns = self._get_column_layout(
+            getattr(self.main_window, 'tree_column_mapping', {})
+        )["tree_columns"]
+        return tree_columns[0] if tree_columns else 4
+    
+    def resolve_value_column(self, column_index: int):
+        """Источник данных колонки дерева
+        
+        Returns:
+            Кортеж (ключ данных, колонка, плоский ключ или None, индекс значения)
+            или None, если колонка не содержит значений
+        """
+        column_sources = self._get_column_layout(
+            getattr(self.main_window, 'tree_column_mapping', {})
+        )["column_sources"]
+        if 0 <= column_index < len(column_sources):
+            return column_sources[column_index]
+        return None
+    
+    def sum_selected_values(self, selected_items, column_index: int):
+        """Сумма исходных значений выделенных строк по колонке дерева
+        
+        Args:
+            selected_items: Выделенные элементы дерева
+            column_index: Индекс колонки дерева
+        
+        Returns:
+            Кортеж (сумма, количество суммированных значений) или None, если
+            матрица значений раздела недоступна (тогда сумма считается построчно)
+        """
+        column_values = self._column_values
+        if column_values is None:
+            return None
+        source = self.resolve_value_column(column_index)
+        if source is None:
+            # Колонка не содержит значений
+            return 0.0, 0
+        row_indexes = [tree_item.data(0, ROW_INDEX_ROLE) for tree_item in selected_items]
+        if any(row_index is None or row_index >= len(column_values) for row_index in row_indexes):
+            return None
+        values = column_values[np.array(row_indexes, dtype=np.intp), source[3]]
+        mask = ~np.isnan(values)
+        return float(values[mask].sum()), int(mask.sum())
+    
     def _is_value_different(self, original: float, calculated: float) -> bool:
         """Проверка различия значений (аналогично методу в Form0503317)"""
+        key = (original, calculated)
+        try:
+            return self._diff_cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # Нехэшируемые значения не кэшируем
+            return self._compute_value_different(original, calculated)
+        result = self._compute_value_different(original, calculated)
+        self._diff_cache[key] = result
+        return result
+    
+    @staticmethod
+    def _compute_value_different(original, calculated) -> bool:
+        """Непосредственное сравнение значений без кэша"""
         try:
             original_val = float(original) if original not in (None, "", "x") else 0.0
             calculated_val = float(calculated) if calculated not in (None, "", "x") else 0.0
@@ -305,6 +632,20 @@ class TreeBuilder:
     
     def format_budget_value(self, value):
         """Форматирование значения бюджета для отображения"""
+        try:
+            return self._format_cache[value]
+        except KeyError:
+            pass
+        except TypeError:
+            # Нехэшируемые значения не кэшируем
+            return self._compute_budget_value_text(value)
+        text = self._compute_budget_value_text(value)
+        self._format_cache[value] = text
+        return text
+    
+    @staticmethod
+    def _compute_budget_value_text(value):
+        """Непосредственное форматирование значения без кэша"""
         if value in (None, "", "0", 0):
             return ""
         if value == 'x':
@@ -314,8 +655,37 @@ class TreeBuilder:
         except (ValueError, TypeError):
             return str(value)
     
+    def _annotate_deficit_row(self, project, data):
+        """Добавление расчетных значений в строку 450 раздела "Расходы"
+        
+        Для раздела "Расходы" подсвечиваем строку 450, сравнивая
+        план/исполнение с пересчитанным результатом исполнения бюджета
+        (дефицит/профицит), который теперь берём из calculated_deficit_proficit.
+        """
+        if (
+            self.main_window.current_section == "Расходы"
+            and project.data.get('calculated_deficit_proficit')
+        ):
+            результат_data = project.data['calculated_deficit_proficit']
+            # Ищем строку с кодом 450
+            for row in data:
+                if str(row.get('код_строки', '')).strip() == '450':
+                    # Добавляем расчетные значения для проверки несоответствий
+                    for col in Form0503317Constants.BUDGET_COLUMNS:
+                        row[f'расчетный_утвержденный_{col}'] = результат_data.get(
+                            'утвержденный', {}
+                        ).get(col, 0)
+                        row[f'расчетный_исполненный_{col}'] = результат_data.get(
+                            'исполненный', {}
+                        ).get(col, 0)
+                    break
+    
     def load_project_data_to_tree(self, project):
         """Загрузка данных проекта в древовидное представление"""
+        # Ограничиваем размер кэшей значений одной загрузкой
+        self._diff_cache.clear()
+        self._format_cache.clear()
+        self._row_items = {}
         try:
             if not project:
                 self.main_window.status_bar.showMessage("Проект не выбран")
@@ -345,46 +715,24 @@ class TreeBuilder:
                 if tree:
                     tree.clear()
             
-            # Загружаем данные текущего раздела
-            section_map = {
-                "Доходы": "доходы_data",
-                "Расходы": "расходы_data", 
-                "Источники финансирования": "источники_финансирования_data",
-                "Консолидируемые расчеты": "консолидируемые_расчеты_data"
-            }
-
             # Настраиваем заголовки дерева под выбранный раздел
             if hasattr(self.main_window, 'tree_config'):
                 self.main_window.tree_config.configure_tree_headers(self.main_window.current_section)
             elif hasattr(self.main_window, 'configure_tree_headers'):
                 self.main_window.configure_tree_headers(self.main_window.current_section)
             
-            section_key = section_map.get(self.main_window.current_section)
+            # Столбец суммы выделения по умолчанию - первый столбец значений раздела
+            if getattr(self.main_window, 'selection_start_column', None) is None:
+                self.main_window.selection_start_column = self.default_value_column()
+            
+            section_key = _SECTION_DATA_KEYS.get(self.main_window.current_section)
             if section_key and section_key in project.data:
                 data = project.data[section_key]
                 if data and len(data) > 0:
-                    # Для раздела "Расходы" подсвечиваем строку 450, сравнивая
-                    # план/исполнение с пересчитанным результатом исполнения бюджета
-                    # (дефицит/профицит), который теперь берём из calculated_deficit_proficit.
-                    if (
-                        self.main_window.current_section == "Расходы"
-                        and project.data.get('calculated_deficit_proficit')
-                    ):
-                        результат_data = project.data['calculated_deficit_proficit']
-                        # Ищем строку с кодом 450
-                        for row in data:
-                            if str(row.get('код_строки', '')).strip() == '450':
-                                # Добавляем расчетные значения для проверки несоответствий
-                                for col in Form0503317Constants.BUDGET_COLUMNS:
-                                    row[f'расчетный_утвержденный_{col}'] = результат_data.get(
-                                        'утвержденный', {}
-                                    ).get(col, 0)
-                                    row[f'расчетный_исполненный_{col}'] = результат_data.get(
-                                        'исполненный', {}
-                                    ).get(col, 0)
-                                break
+                    self._annotate_deficit_row(project, data)
                     
                     # Строим дерево для всех виджетов (в главном окне и открепленных)
+                    section_cells = None
                     for tree_widget in tree_widgets:
                         # Сначала настраиваем заголовки, чтобы кастомный заголовок был установлен
                         if hasattr(self.main_window, 'tree_config'):
@@ -395,8 +743,14 @@ class TreeBuilder:
                             self.main_window._configure_tree_headers_for_widget(
                                 tree_widget, self.main_window.current_section
                             )
+                        # Значения раздела собираем один раз для всех деревьев
+                        # (mapping колонок известен только после настройки заголовков)
+                        if section_cells is None:
+                            section_cells = self._compute_section_cells(
+                                data, getattr(self.main_window, 'tree_column_mapping', {})
+                            )
                         # Затем загружаем данные
-                        self.build_tree_from_data(data, tree_widget)
+                        self.build_tree_from_data(data, tree_widget, section_cells)
                     
                     # Обновляем высоту заголовка после загрузки данных
                     # Обновляем синхронно и через таймер для надежности
@@ -416,7 +770,7 @@ class TreeBuilder:
                         self.main_window.load_errors_to_tab(project.data)
                     
                     # Применяем скрытие нулевых столбцов, если чекбокс включен
-                    if hasattr(self.main_window, 'hide_zero_columns_checkbox') and self.main_window.hide_zero_columns_checkbox.isChecked():
+                    if self.main_window.hide_zero_columns_checkbox is not None and self.main_window.hide_zero_columns_checkbox.isChecked():
                         from PyQt5.QtCore import QTimer
                         QTimer.singleShot(150, lambda: self.main_window.apply_hide_zero_columns())
                     self.main_window.status_bar.showMessage(f"Загружено {len(data)} записей в разделе '{self.main_window.current_section}'")
@@ -429,6 +783,92 @@ class TreeBuilder:
             logger.error(error_msg, exc_info=True)
             self.main_window.status_bar.showMessage(error_msg)
     
+    def update_project_data_in_tree(self, project):
+        """Инкрементальное обновление дерева после пересчета
+        
+        Структура строк при пересчете не меняется, меняются только суммы,
+        поэтому существующие элементы находятся по ключу строки и в них
+        обновляются только изменившиеся ячейки. Если строки раздела не
+        совпадают с загруженными, дерево перестраивается полностью.
+        """
+        if not project or not project.data:
+            self.load_project_data_to_tree(project)
+            return
+        
+        section_key = _SECTION_DATA_KEYS.get(self.main_window.current_section)
+        data = project.data.get(section_key) if section_key else None
+        tree_widgets = self._get_tree_widgets()
+        mapping = getattr(self.main_window, 'tree_column_mapping', {})
+        indexes = [self._row_items.get(tree_widget) for tree_widget in tree_widgets]
+        if (
+            not data
+            or not tree_widgets
+            or mapping is not self._row_items_mapping
+            or any(index is None or len(index) != len(data) for index in indexes)
+        ):
+            self.load_project_data_to_tree(project)
+            return
+        
+        try:
+            row_keys = [self._row_key(item) for item in data]
+            if any(row_key not in indexes[0] for row_key in row_keys):
+                self.load_project_data_to_tree(project)
+                return
+        except (AttributeError, TypeError):
+            # Строка не является словарем или ключ не хэшируется
+            self.load_project_data_to_tree(project)
+            return
+        
+        self._diff_cache.clear()
+        self._format_cache.clear()
+        self._annotate_deficit_row(project, data)
+        section_cells = self._compute_section_cells(data, mapping)
+        tree_columns = self._get_column_layout(mapping)["tree_columns"]
+        updated_cells = 0
+        
+        for tree_widget, index in zip(tree_widgets, indexes):
+            column_count = tree_widget.columnCount()
+            value_columns = [col_index for col_index in tree_columns if col_index < column_count]
+            # Как и при полном построении, отключаем перерисовку и сигналы дерева
+            # (setText/setData на каждой строке иначе вызывают itemChanged)
+            updates_were_enabled = tree_widget.updatesEnabled()
+            signals_were_blocked = tree_widget.blockSignals(True)
+            tree_widget.setUpdatesEnabled(False)
+            try:
+                for position, item in enumerate(data):
+                    tree_item = index[row_keys[position]]
+                    row, error_columns = self._build_row(
+                        item, item.get('уровень', 0), column_count,
+                        section_cells[position] if section_cells else None
+                    )
+                    for col_index in value_columns:
+                        text = row[col_index]
+                        if tree_item.text(col_index) == text:
+                            continue
+                        tree_item.setText(col_index, text)
+                        # Цвет текста меняется вместе с текстом (значение с расчетным в скобках);
+                        # у исправленных ячеек роль цвета очищается, как при полном построении
+                        if col_index in error_columns:
+                            tree_item.setForeground(col_index, self._error_brush)
+                        else:
+                            tree_item.setData(col_index, Qt.ForegroundRole, None)
+                        updated_cells += 1
+                    # Обработчики выделения читают актуальную строку данных
+                    tree_item.setData(0, Qt.UserRole, item)
+                    tree_item.setData(0, ROW_INDEX_ROLE, position)
+            finally:
+                tree_widget.blockSignals(signals_were_blocked)
+                tree_widget.setUpdatesEnabled(updates_were_enabled)
+        
+        logger.debug(f"Инкрементальное обновление дерева: изменено ячеек {updated_cells}")
+        
+        # Итоги раздела изменились - пересчитываем скрытие нулевых столбцов
+        if self.main_window.hide_zero_columns_checkbox is not None and self.main_window.hide_zero_columns_checkbox.isChecked():
+            self.main_window.apply_hide_zero_columns()
+        self.main_window.status_bar.showMessage(
+            f"Обновлено {len(data)} записей в разделе '{self.main_window.current_section}'"
+        )
+    
     def _get_tree_widgets(self):
         """Получить все виджеты дерева (в главном окне и открепленных)"""
         widgets = []
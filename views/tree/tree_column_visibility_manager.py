@@ -12,6 +12,63 @@ class TreeColumnVisibilityManager:
             main_window: Ссылка на главное окно для доступа к свойствам
         """
         self.main_window = main_window
+        # Кэш итоговых строк по разделам: {section_key: (data, total_item)}
+        self._section_totals = {}
+        # Кэш нормализованных наименований и кодов строк: {section_key: (data, [(name, code), ...])}
+        self._normalized_rows = {}
+    
+    def _get_normalized_rows(self, section_key: str, data):
+        """Нормализованные (наименование, код строки) для каждой строки раздела
+        
+        Нормализация выполняется один раз для объекта данных; сами строки данных
+        не изменяются, так как они используются при расчетах и экспорте.
+        
+        Args:
+            section_key: Ключ раздела данных
+            data: Данные раздела
+        
+        Returns:
+            Список кортежей (name, code) в нижнем регистре без пробелов по краям
+        """
+        cached = self._normalized_rows.get(section_key)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        
+        normalized = [
+            (
+                str(item.get("наименование_показателя", "")).strip().lower(),
+                str(item.get("код_строки", "")).strip().lower(),
+            )
+            for item in data
+        ]
+        self._normalized_rows[section_key] = (data, normalized)
+        return normalized
+    
+    def _find_total_item(self, section_key: str, data, is_total):
+        """Поиск итоговой строки раздела с кэшированием
+        
+        Кэш действителен, пока данные раздела остаются тем же объектом.
+        
+        Args:
+            section_key: Ключ раздела данных
+            data: Данные раздела
+            is_total: Функция (name, code) -> bool для распознавания итоговой строки
+        
+        Returns:
+            Итоговая строка или None
+        """
+        cached = self._section_totals.get(section_key)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        
+        total_item = None
+        for item, (name, code) in zip(data, self._get_normalized_rows(section_key, data)):
+            if is_total(name, code):
+                total_item = item
+                break
+        
+        self._section_totals[section_key] = (data, total_item)
+        return total_item
     
     def hide_zero_columns(self, section_key: str, data, tree_widget):
         """
@@ -39,14 +96,11 @@ class TreeColumnVisibilityManager:
             return
 
         # Ищем итоговую строку
-        total_item = None
-        for item in data:
-            name = str(item.get("наименование_показателя", "")).strip().lower()
-            code = str(item.get("код_строки", "")).strip().lower()
-            # Для консолидированных: строка начинается с "всего" ИЛИ код 899
-            if name.startswith("всего") or code == "899":
-                total_item = item
-                break
+        # Для консолидированных: строка начинается с "всего" ИЛИ код 899
+        total_item = self._find_total_item(
+            "консолидируемые_расчеты_data", data,
+            lambda name, code: name.startswith("всего") or code == "899"
+        )
         if not total_item:
             return
 
@@ -63,12 +117,7 @@ class TreeColumnVisibilityManager:
                     zero_cols.append(col_index)
 
         # Сужаем «нулевые» колонки до минимальной ширины и очищаем заголовки
-        header_item = tree_widget.headerItem()
-        for col_index in zero_cols:
-            header.resizeSection(col_index, 2)  # минимальная ширина
-            if header_item:
-                header_item.setText(col_index, "")
-                header_item.setToolTip(col_index, "")
+        self._collapse_columns(tree_widget, header, zero_cols)
     
     def _hide_zero_columns_budget(self, section_key: str, data, tree_widget):
         """Скрытие нулевых колонок для бюджетных разделов"""
@@ -77,13 +126,10 @@ class TreeColumnVisibilityManager:
         if mapping.get("type") != "budget":
             return
 
-        total_item = None
-        for item in data:
-            name = str(item.get("наименование_показателя", "")).strip().lower()
-            # Ищем первую строку, где встречается слово "всего"
-            if "всего" in name:
-                total_item = item
-                break
+        # Ищем первую строку, где встречается слово "всего"
+        total_item = self._find_total_item(
+            section_key, data, lambda name, code: "всего" in name
+        )
         
         if not total_item:
             logger.debug(f"Итоговая строка не найдена для раздела {section_key}")
@@ -115,12 +161,35 @@ class TreeColumnVisibilityManager:
                         zero_cols.add(exec_idx)
 
         # Сужаем «нулевые» колонки до минимальной ширины и очищаем заголовки
+        self._collapse_columns(tree_widget, header, zero_cols)
+    
+    def _collapse_columns(self, tree_widget, header, zero_cols):
+        """Сужение колонок до минимальной ширины одним пакетом
+        
+        Перерисовка дерева отключается на время изменений, после чего
+        выполняется одно обновление. Сигналы заголовка не блокируются:
+        sectionResized нужен дереву для пересчета геометрии и прокрутки.
+        
+        Args:
+            tree_widget: Виджет дерева
+            header: Заголовок дерева
+            zero_cols: Индексы сужаемых колонок
+        """
+        if not zero_cols:
+            return
+        
         header_item = tree_widget.headerItem()
-        for col_index in zero_cols:
-            header.resizeSection(col_index, 2)  # минимальная ширина
-            if header_item:
-                header_item.setText(col_index, "")
-                header_item.setToolTip(col_index, "")
+        # Восстанавливаем прежнее состояние: вызывающий код мог уже отключить перерисовку
+        updates_were_enabled = tree_widget.updatesEnabled()
+        tree_widget.setUpdatesEnabled(False)
+        try:
+            for col_index in zero_cols:
+                header.resizeSection(col_index, 2)  # минимальная ширина
+                if header_item:
+                    header_item.setText(col_index, "")
+                    header_item.setToolTip(col_index, "")
+        finally:
+            tree_widget.setUpdatesEnabled(updates_were_enabled)
     
     def apply_data_type_visibility(self, data_type: str, tree_widget):
         """Скрывает столбцы дерева в зависимости от выбранного типа данных
@@ -141,13 +210,24 @@ class TreeColumnVisibilityManager:
             show_approved = data_type in ("Утвержденный", "Оба")
             show_executed = data_type in ("Исполненный", "Оба")
             
-            approved_range = range(approved_start, executed_start)
-            executed_range = range(executed_start, executed_start + len(budget_cols))
+            # Вычисляем требуемую видимость всех колонок за один проход
+            column_total = max(tree_widget.columnCount(), executed_start + len(budget_cols))
+            hidden_flags = [None] * column_total
+            for idx in range(approved_start, executed_start):
+                hidden_flags[idx] = not show_approved
+            for idx in range(executed_start, executed_start + len(budget_cols)):
+                hidden_flags[idx] = not show_executed
             
-            for idx in approved_range:
-                tree_widget.setColumnHidden(idx, not show_approved)
-            for idx in executed_range:
-                tree_widget.setColumnHidden(idx, not show_executed)
+            # Меняем только колонки, состояние которых действительно отличается
+            # (прежнее состояние перерисовки восстанавливаем, а не включаем безусловно)
+            updates_were_enabled = tree_widget.updatesEnabled()
+            tree_widget.setUpdatesEnabled(False)
+            try:
+                for idx, hidden in enumerate(hidden_flags):
+                    if hidden is not None and tree_widget.isColumnHidden(idx) != hidden:
+                        tree_widget.setColumnHidden(idx, hidden)
+            finally:
+                tree_widget.setUpdatesEnabled(updates_were_enabled)
     
     def show_all_columns(self, tree_widget):
         """Показать все столбцы в дереве и вернуть им нормальные ширины/заголовки
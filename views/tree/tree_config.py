@@ -28,6 +28,9 @@ class TreeConfig:
         self.header_configurator = TreeHeaderConfigurator()
         self.visibility_manager = TreeColumnVisibilityManager(main_window)
         self.layout_helper = TreeHeaderLayoutHelper(main_window)
+        
+        # Единый делегат переноса текста для всех деревьев (не пересоздается при смене раздела)
+        self.word_wrap_delegate = WordWrapItemDelegate(main_window)
     
     def configure_tree_headers(self, section_name: str):
         """Конфигурация заголовков дерева под выбранный раздел"""
@@ -65,7 +68,8 @@ class TreeConfig:
             mapping = self.tree_column_mapping or getattr(self.main_window, 'tree_column_mapping', {})
         
         # Устанавливаем делегат для переноса текста в ячейках
-        tree_widget.setItemDelegate(WordWrapItemDelegate())
+        if tree_widget.itemDelegate() is not self.word_wrap_delegate:
+            tree_widget.setItemDelegate(self.word_wrap_delegate)
         # Отключаем единую высоту строк, чтобы высота подстраивалась под содержимое
         tree_widget.setUniformRowHeights(False)
         
@@ -76,14 +80,16 @@ class TreeConfig:
         
         tree_widget.setColumnCount(len(display_headers))
         
+        # Словарь текстов заголовков строим один раз и переиспользуем
+        header_texts = dict(enumerate(display_headers))
+        
         # Проверяем, есть ли уже кастомный заголовок, если нет - создаем новый
         header = tree_widget.header()
         if not isinstance(header, WrapHeaderView):
             # Создаем и устанавливаем кастомный заголовок с поддержкой переноса текста
-            custom_header = WrapHeaderView(Qt.Horizontal, tree_widget)
-            custom_header.setHeaderTexts({idx: text for idx, text in enumerate(display_headers)})
-            tree_widget.setHeader(custom_header)
-            header = tree_widget.header()
+            header = WrapHeaderView(Qt.Horizontal, tree_widget)
+            header.setHeaderTexts(header_texts)
+            tree_widget.setHeader(header)
         
         # Устанавливаем заголовки ПОСЛЕ установки кастомного заголовка
         tree_widget.setHeaderLabels(display_headers)
@@ -91,19 +97,14 @@ class TreeConfig:
         # Убеждаемся, что заголовок видим
         tree_widget.setHeaderHidden(False)
         
-        # После setHeaderLabels нужно снова получить заголовок, так как он может быть пересоздан
-        header = tree_widget.header()
-        
-        # Если заголовок не кастомный, создаем и устанавливаем его снова
-        if not isinstance(header, WrapHeaderView):
-            custom_header = WrapHeaderView(Qt.Horizontal, tree_widget)
-            custom_header.setHeaderTexts({idx: text for idx, text in enumerate(display_headers)})
-            tree_widget.setHeader(custom_header)
-            header = tree_widget.header()
+        # После setHeaderLabels проверяем, что заголовок не был пересоздан,
+        # и при необходимости устанавливаем кастомный заголовок снова
+        if tree_widget.header() is not header:
+            header = WrapHeaderView(Qt.Horizontal, tree_widget)
+            tree_widget.setHeader(header)
         
         # Обновляем тексты заголовков в кастомном заголовке
-        if isinstance(header, WrapHeaderView):
-            header.setHeaderTexts({idx: text for idx, text in enumerate(display_headers)})
+        header.setHeaderTexts(header_texts)
         
         header.setDefaultAlignment(Qt.AlignCenter)
         
@@ -185,7 +186,7 @@ class TreeConfig:
         
         # Обновляем тексты заголовков в кастомном заголовке при изменении размера
         if isinstance(header, WrapHeaderView):
-            header.setHeaderTexts({idx: text for idx, text in enumerate(display_headers)})
+            header.setHeaderTexts(header_texts)
             header.update()  # Принудительно обновляем отрисовку
 
         # Для консолидируемых расчетов колонку "Код классификации" не показываем
@@ -1,6 +1,12 @@
 """Обработчики событий дерева"""
 from PyQt5.QtWidgets import QMenu, QTreeWidgetItem, QApplication
 from PyQt5.QtCore import Qt
+import numpy as np
+import pandas as pd
+
+
+# Замена разделителя тысяч на пробел при форматировании сумм
+_THOUSANDS_TO_SPACE = str.maketrans(",", " ")
 
 
 class TreeHandlers:
@@ -12,6 +18,8 @@ class TreeHandlers:
             main_window: Ссылка на главное окно для доступа к методам и свойствам
         """
         self.main_window = main_window
+        # Буфер обмена приложения (один на все время работы)
+        self._clipboard = QApplication.clipboard()
     
     def on_tree_item_clicked(self, item, column):
         """Обработка клика по элементу дерева"""
@@ -28,30 +36,10 @@ class TreeHandlers:
             self.main_window.status_bar.showMessage("Готов к работе")
             return
         
-        # Определяем столбец: сначала используем сохраненный, если нет - текущий столбец
-        column_index = getattr(self.main_window, 'selection_start_column', None)
+        # Столбец начала выделения (по умолчанию задается при загрузке раздела)
+        column_index = self.main_window.selection_start_column
         if column_index is None:
-            # Пытаемся определить столбец из текущего элемента
-            current_item = self.main_window.data_tree.currentItem()
-            if current_item:
-                # Используем столбец текущего элемента
-                column_index = self.main_window.data_tree.currentColumn()
-                if column_index < 0:
-                    column_index = 0
-            else:
-                # Если не можем определить, используем первый столбец данных (после базовых)
-                mapping = getattr(self.main_window, 'tree_column_mapping', {})
-                column_type = mapping.get("type", "base")
-                if column_type == "budget":
-                    column_index = mapping.get("approved_start", 4)
-                elif column_type == "consolidated":
-                    column_index = mapping.get("value_start", 4)
-                else:
-                    column_index = 4  # По умолчанию
-        
-        # Определяем тип столбца и получаем данные
-        mapping = getattr(self.main_window, 'tree_column_mapping', {})
-        column_type = mapping.get("type", "base")
+            column_index = self.main_window.tree_builder.default_value_column()
         
         total = 0.0
         count = 0
@@ -62,71 +50,54 @@ class TreeHandlers:
         if column_index < len(tree_headers):
             column_name = tree_headers[column_index]
         
-        # Обрабатываем выбранные элементы
-        for tree_item in selected_items:
-            # Получаем исходные данные из UserRole
-            item_data = tree_item.data(0, Qt.UserRole)
-            if not item_data or not isinstance(item_data, dict):
-                continue
-            
-            value = None
-            
-            if column_type == "budget":
-                # Бюджетные столбцы (утвержденный/исполненный)
-                budget_cols = mapping.get("budget_columns", [])
-                approved_start = mapping.get("approved_start", 4)
-                executed_start = mapping.get("executed_start", approved_start + len(budget_cols))
-                
-                if approved_start <= column_index < executed_start:
-                    # Столбец утвержденного
-                    col_idx = column_index - approved_start
-                    if col_idx < len(budget_cols):
-                        col_name = budget_cols[col_idx]
-                        approved_data = item_data.get('утвержденный', {}) or {}
-                        value = approved_data.get(col_name, 0) or 0
-                elif executed_start <= column_index < executed_start + len(budget_cols):
-                    # Столбец исполненного
-                    col_idx = column_index - executed_start
-                    if col_idx < len(budget_cols):
-                        col_name = budget_cols[col_idx]
-                        executed_data = item_data.get('исполненный', {}) or {}
-                        value = executed_data.get(col_name, 0) or 0
-            
-            elif column_type == "consolidated":
-                # Консолидируемые расчеты
-                value_start = mapping.get("value_start", 4)
-                cons_cols = mapping.get("columns", [])
-                
-                if value_start <= column_index < value_start + len(cons_cols):
-                    col_idx = column_index - value_start
-                    if col_idx < len(cons_cols):
-                        col_name = cons_cols[col_idx]
-                        cons_data = item_data.get('поступления', {}) or {}
-                        if isinstance(cons_data, dict) and col_name in cons_data:
-                            value = cons_data.get(col_name, 0) or 0
-                        else:
-                            # Проверяем плоские поля
-                            value = item_data.get(f'поступления_{col_name}', 0) or 0
-            
-            # Преобразуем значение в число и добавляем к сумме
-            if value is not None:
-                try:
-                    if value == 'x' or value == '':
-                        continue
-                    num_value = float(value)
-                    total += num_value
-                    count += 1
-                except (ValueError, TypeError):
-                    continue
+        # Сумма по матрице значений раздела одной операцией NumPy
+        vectorized = self.main_window.tree_builder.sum_selected_values(selected_items, column_index)
+        if vectorized is not None:
+            total, count = vectorized
+        else:
+            # Построчный расчет (если матрица значений недоступна)
+            source = self.main_window.tree_builder.resolve_value_column(column_index)
+            if source is not None:
+                total, count = self._sum_selected_items(selected_items, source)
         
         # Форматируем и выводим результат
         if count > 0:
-            formatted_total = f"{total:,.2f}".replace(",", " ")
+            formatted_total = f"{total:,.2f}".translate(_THOUSANDS_TO_SPACE)
             message = f"Выбрано строк: {count} | Сумма по столбцу '{column_name}': {formatted_total}"
             self.main_window.status_bar.showMessage(message)
         else:
             self.main_window.status_bar.showMessage("Готов к работе")
     
+    def _sum_selected_items(self, selected_items, source):
+        """Построчная сумма значений выделенных элементов
+        
+        Args:
+            selected_items: Выделенные элементы дерева
+            source: Источник данных колонки (см. TreeBuilder.resolve_value_column)
+        
+        Returns:
+            Кортеж (сумма, количество суммированных значений)
+        """
+        data_key, col_name, flat_key, _ = source
+        raw_values = []
+        for tree_item in selected_items:
+            # Получаем исходные данные из UserRole (дерево строится только из строк-словарей)
+            item_data = tree_item.data(0, Qt.UserRole)
+            if not item_data:
+                continue
+            
+            values = item_data.get(data_key, {}) or {}
+            if isinstance(values, dict) and (flat_key is None or col_name in values):
+                raw_values.append(values.get(col_name, 0) or 0)
+            else:
+                # Проверяем плоские поля
+                raw_values.append(item_data.get(flat_key, 0) or 0)
+        
+        # Преобразуем значения в числа одной операцией: "x" и нечисловые значения пропускаются
+        numeric = pd.to_numeric(pd.Series(raw_values, dtype=object), errors="coerce").to_numpy(dtype=float)
+        numeric = numeric[~np.isnan(numeric)]
+        return float(numeric.sum()), int(numeric.size)
+    
     def show_tree_context_menu(self, position):
         """Контекстное меню для дерева"""
         item = self.main_window.data_tree.itemAt(position)
@@ -162,33 +133,47 @@ class TreeHandlers:
     
     def show_all_columns(self):
         """Показать все столбцы в дереве и вернуть им нормальные ширины/заголовки"""
-        # Используем tree_config для переинициализации заголовков
-        if hasattr(self.main_window, 'tree_config'):
-            self.main_window.tree_config.configure_tree_headers(self.main_window.current_section)
-        elif hasattr(self.main_window, '_configure_tree_headers_for_widget'):
-            tree_widgets = self._get_tree_widgets()
-            for tree_widget in tree_widgets:
-                if tree_widget:
-                    self.main_window._configure_tree_headers_for_widget(
-                        tree_widget, self.main_window.current_section
-                    )
+        # Перенастройка заголовков выполняется без промежуточных перерисовок
+        frozen_widgets = [
+            (tree_widget, tree_widget.header(), tree_widget.updatesEnabled())
+            for tree_widget in self._get_tree_widgets()
+        ]
+        for tree_widget, header, _ in frozen_widgets:
+            tree_widget.setUpdatesEnabled(False)
+            header.setUpdatesEnabled(False)
+        try:
+            # Используем tree_config для переинициализации заголовков
+            if hasattr(self.main_window, 'tree_config'):
+                self.main_window.tree_config.configure_tree_headers(self.main_window.current_section)
+            elif hasattr(self.main_window, '_configure_tree_headers_for_widget'):
+                tree_widgets = self._get_tree_widgets()
+                for tree_widget in tree_widgets:
+                    if tree_widget:
+                        self.main_window._configure_tree_headers_for_widget(
+                            tree_widget, self.main_window.current_section
+                        )
 
-        # Снова применяем фильтр по типу данных (утверждённый/исполненный/оба)
-        # и показываем все столбцы через visibility_manager
-        if hasattr(self.main_window, 'tree_config'):
-            tree_widgets = self.main_window.tree_config._get_tree_widgets()
-            for tree_widget in tree_widgets:
-                self.main_window.tree_config.visibility_manager.show_all_columns(tree_widget)
-            self.main_window.tree_config.apply_tree_data_type_visibility()
-        elif hasattr(self.main_window, 'apply_tree_data_type_visibility'):
-            self.main_window.apply_tree_data_type_visibility()
+            # Снова применяем фильтр по типу данных (утверждённый/исполненный/оба)
+            # и показываем все столбцы через visibility_manager
+            if hasattr(self.main_window, 'tree_config'):
+                tree_widgets = self.main_window.tree_config._get_tree_widgets()
+                for tree_widget in tree_widgets:
+                    self.main_window.tree_config.visibility_manager.show_all_columns(tree_widget)
+                self.main_window.tree_config.apply_tree_data_type_visibility()
+            elif hasattr(self.main_window, 'apply_tree_data_type_visibility'):
+                self.main_window.apply_tree_data_type_visibility()
+        finally:
+            for tree_widget, _, was_updating in frozen_widgets:
+                # Заголовок берем заново: при перенастройке он мог быть заменен
+                tree_widget.header().setUpdatesEnabled(True)
+                tree_widget.setUpdatesEnabled(was_updating)
+                tree_widget.viewport().update()
     
     def copy_tree_item_value(self, item):
         """Копировать значение из дерева"""
         if item:
             text = item.text(0)  # Копируем значение из первого столбца
-            clipboard = QApplication.clipboard()
-            clipboard.setText(text)
+            self._clipboard.setText(text)
     
     def on_tree_item_expanded(self, item):
         """Обработка разворачивания узла дерева"""
@@ -20,6 +20,7 @@ class TreeHeaderLayoutHelper:
         Args:
             tree_widget: Виджет дерева
         """
+        header = None
         try:
             header = tree_widget.header()
             font_metrics = header.fontMetrics()
@@ -29,25 +30,32 @@ class TreeHeaderLayoutHelper:
             header_item = tree_widget.headerItem()
             tree_headers = getattr(self.main_window, 'tree_headers', [])
             
+            # Состояние колонок читаем один раз, чтобы не обращаться к Qt на каждой итерации
+            col_count = tree_widget.columnCount()
+            hidden = [tree_widget.isColumnHidden(i) for i in range(col_count)]
+            sizes = [header.sectionSize(i) for i in range(col_count)]
+            
             if header_item:
                 # Проходим по всем заголовкам и вычисляем максимальную высоту с учетом переноса
-                for idx in range(tree_widget.columnCount()):
-                    if tree_widget.isColumnHidden(idx):
+                for idx in range(col_count):
+                    if hidden[idx]:
                         continue
                     
                     # Получаем текст из headerItem
-                    text = header_item.text(idx) if idx < tree_widget.columnCount() else ""
+                    text = header_item.text(idx)
                     if not text and idx < len(tree_headers):
                         text = tree_headers[idx]
                     
                     if text:
-                        height = self._calculate_header_height(header, text, idx)
+                        height = self._calculate_header_height(header, text, sizes[idx])
                         max_height = max(max_height, height)
             else:
                 # Если нет headerItem, используем tree_headers
                 for idx, text in enumerate(tree_headers):
-                    if text and not tree_widget.isColumnHidden(idx):
-                        height = self._calculate_header_height(header, text, idx)
+                    if idx >= col_count:
+                        break
+                    if text and not hidden[idx]:
+                        height = self._calculate_header_height(header, text, sizes[idx])
                         max_height = max(max_height, height)
             
             # Устанавливаем высоту заголовка с небольшим отступом
@@ -61,25 +69,25 @@ class TreeHeaderLayoutHelper:
             logger.warning(f"Ошибка обновления высоты заголовка дерева: {e}", exc_info=True)
             # В случае ошибки используем минимальную высоту
             try:
-                header = self.main_window.data_tree.header()
-                font_metrics = header.fontMetrics()
-                header.setFixedHeight(font_metrics.lineSpacing() + 6)
+                if header is None:
+                    header = self.main_window.data_tree.header()
+                header.setFixedHeight(header.fontMetrics().lineSpacing() + 6)
             except:
                 pass
     
-    def _calculate_header_height(self, header, text: str, column_index: int) -> float:
+    def _calculate_header_height(self, header, text: str, section_size: int) -> float:
         """Вычисление высоты заголовка для конкретной колонки
         
         Args:
             header: Заголовок дерева
             text: Текст заголовка
-            column_index: Индекс колонки
+            section_size: Текущая ширина колонки
         
         Returns:
             Высота заголовка в пикселях
         """
         # Получаем ширину столбца
-        width = max(header.sectionSize(column_index), 50)
+        width = max(section_size, 50)
         
         # Создаем документ для расчета высоты с учетом переноса
         doc = QTextDocument()
@@ -2,5 +2,6 @@
 from .custom_headers import WrapHeaderView
 from .custom_delegates import WordWrapItemDelegate
 from .detached_tab_window import DetachedTabWindow
+from .tree_tooltip_filter import TreeToolTipFilter
 
-__all__ = ['WrapHeaderView', 'WordWrapItemDelegate', 'DetachedTabWindow']
+__all__ = ['WrapHeaderView', 'WordWrapItemDelegate', 'DetachedTabWindow', 'TreeToolTipFilter']
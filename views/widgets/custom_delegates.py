@@ -8,6 +8,14 @@ from PyQt5.QtGui import (QTextDocument, QTextOption, QTextCharFormat,
 class WordWrapItemDelegate(QStyledItemDelegate):
     """Делегат для переноса текста в ячейках дерева"""
     
+    # Предельный размер кэша размеров ячеек (при превышении кэш очищается)
+    _SIZE_CACHE_LIMIT = 50000
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Кэш размеров ячеек с переносом: (текст, ширина, шрифт) -> (ширина, высота)
+        self._size_cache = {}
+    
     def _calculate_item_level(self, index) -> int:
         """Вычисление уровня элемента для внутреннего отступа справа
         
@@ -283,6 +291,17 @@ class WordWrapItemDelegate(QStyledItemDelegate):
             text_width = option.fontMetrics.horizontalAdvance(str(text))
             return QSize(text_width, option.fontMetrics.height())
         
+        # Устанавливаем ширину документа равной ширине столбца с учетом внутреннего отступа справа
+        # Для столбца "Наименование" вычитаем отступ справа
+        available_width = column_width - right_padding if column == 0 else column_width
+        
+        # Высота строк переменная (перенос текста), поэтому размер измеряется для
+        # каждой строки; одинаковые тексты при той же ширине и шрифте не измеряем повторно
+        cache_key = (str(text), available_width, option.font.key())
+        cached = self._size_cache.get(cache_key)
+        if cached is not None:
+            return QSize(*cached)
+        
         # Для остальных столбцов создаем документ для расчета размера с переносом
         doc = QTextDocument()
         doc.setDefaultFont(option.font)
@@ -293,10 +312,11 @@ class WordWrapItemDelegate(QStyledItemDelegate):
         text_option.setWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
         doc.setDefaultTextOption(text_option)
         
-        # Устанавливаем ширину документа равной ширине столбца с учетом внутреннего отступа справа
-        # Для столбца "Наименование" вычитаем отступ справа
-        available_width = column_width - right_padding if column == 0 else column_width
         doc.setTextWidth(available_width)
         
         # Возвращаем размер с учетом переноса
-        return QSize(int(doc.idealWidth()), int(doc.size().height()))
+        size = (int(doc.idealWidth()), int(doc.size().height()))
+        if len(self._size_cache) >= self._SIZE_CACHE_LIMIT:
+            self._size_cache.clear()
+        self._size_cache[cache_key] = size
+        return QSize(*size)
@@ -11,9 +11,13 @@ class WrapHeaderView(QHeaderView):
         super().__init__(orientation, parent)
         self.setTextElideMode(Qt.ElideNone)
         self._header_texts = {}  # Кэш текстов заголовков
+        self._last_texts = None  # Последний установленный набор текстов
     
     def setHeaderTexts(self, texts):
-        """Устанавливает тексты заголовков для кэширования"""
+        """Устанавливает тексты заголовков для кэширования (пропускает, если тексты не изменились)"""
+        if texts is self._last_texts or texts == self._last_texts:
+            return
+        self._last_texts = texts
         self._header_texts = texts
     
     def paintSection(self, painter, rect, logicalIndex):
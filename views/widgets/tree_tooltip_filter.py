@@ -0,0 +1,51 @@
+"""Ленивые подсказки для ячеек дерева"""
+from PyQt5.QtWidgets import QToolTip
+from PyQt5.QtCore import QObject, QEvent
+
+
+class TreeToolTipFilter(QObject):
+    """Фильтр событий, формирующий подсказку ячейки дерева только при наведении
+
+    Подсказка имеет вид "<заголовок колонки>: <текст ячейки>" (или только заголовок
+    для пустой ячейки), как и при установке подсказок для каждой ячейки заранее.
+    """
+
+    def __init__(self, tree_widget, main_window):
+        """
+        Args:
+            tree_widget: Виджет дерева, для которого формируются подсказки
+            main_window: Ссылка на главное окно для доступа к подсказкам заголовков
+        """
+        super().__init__(tree_widget)
+        self.tree_widget = tree_widget
+        self.main_window = main_window
+        tree_widget.viewport().installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        """Обработка события подсказки во вьюпорте дерева"""
+        if event.type() != QEvent.ToolTip:
+            return False
+
+        text = self._build_tooltip(event.pos())
+        if text:
+            QToolTip.showText(event.globalPos(), text, obj)
+        else:
+            QToolTip.hideText()
+            event.ignore()
+        return True
+
+    def _build_tooltip(self, pos) -> str:
+        """Построение текста подсказки для ячейки под курсором"""
+        item = self.tree_widget.itemAt(pos)
+        if item is None:
+            return ""
+        column = self.tree_widget.header().logicalIndexAt(pos.x())
+        tooltips = getattr(self.main_window, 'tree_header_tooltips', [])
+        if column < 0 or column >= len(tooltips):
+            return ""
+
+        tip = tooltips[column]
+        current_text = item.text(column)
+        if current_text:
+            return f"{tip}: {current_text}"
+        return tip